@@ -1,13 +1,17 @@
 """Solution checking API endpoints."""
 
-from pydantic import BaseModel
+import json
+from pydantic import BaseModel, Field
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from engine.solution_checker import check_solution
+from engine.async_executor import check_solution_async, ExecutionQueueFull
+from engine.batch import check_solutions_async, iter_check_solutions_async
+from backend.core.config import settings
 from backend.core.dependencies import get_problem_loader
 from backend.services.problem_service import ProblemService
 
@@ -15,9 +19,31 @@ router = APIRouter(prefix="/check", tags=["check"])
 
 
 class CheckRequest(BaseModel):
-    code: str
+    code: str = Field(max_length=settings.MAX_CODE_LENGTH)
     problem_id: str
-    timeout: float = 5.0
+    timeout: float = Field(5.0, gt=0)
+
+
+class BatchSubmission(BaseModel):
+    problem_id: str
+    code: str = Field(max_length=settings.MAX_CODE_LENGTH)
+
+
+class BatchCheckRequest(BaseModel):
+    submissions: list[BatchSubmission]
+    timeout: float = Field(5.0, gt=0)
+    stream: bool = False
+
+
+def _result_dict(result) -> dict:
+    """Convert a CheckResult into its JSON response form."""
+    return {
+        "is_correct": result.is_correct,
+        "message": result.message,
+        "user_output": result.user_output,
+        "expected_output": result.expected_output,
+        "details": result.details,
+    }
 
 
 @router.post("")
@@ -32,12 +58,67 @@ async def check(
     if problem is None:
         raise HTTPException(status_code=404, detail=f"Problem {request.problem_id} not found")
     
-    result = check_solution(request.code, problem, timeout=request.timeout)
+    try:
+        result = await check_solution_async(request.code, problem, timeout=request.timeout)
+    except ExecutionQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
     
+    return _result_dict(result)
+
+
+@router.post("/batch")
+async def check_batch(
+    request: BatchCheckRequest,
+    loader = Depends(get_problem_loader),
+):
+    """Check many submissions in parallel.
+
+    Returns results in submission order, or, with `stream` set, one JSON
+    object per line tagged with its `index` as each check completes. A
+    streamed check that cannot be queued gets an `error` line instead.
+    """
+    if len(request.submissions) > settings.CHECK_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"A batch may contain at most {settings.CHECK_BATCH_MAX_SIZE} submissions",
+        )
+
+    service = ProblemService(loader)
+    problems = {}
+    for submission in request.submissions:
+        if submission.problem_id not in problems:
+            problems[submission.problem_id] = service.get_problem(submission.problem_id)
+    missing = sorted(problem_id for problem_id, problem in problems.items() if problem is None)
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Problem(s) not found: {', '.join(missing)}")
+
+    pairs = [(s.code, problems[s.problem_id]) for s in request.submissions]
+
+    if request.stream:
+        async def lines():
+            # The response has already started, so a full queue is reported per item
+            results = iter_check_solutions_async(pairs, timeout=request.timeout, return_exceptions=True)
+            async for index, result in results:
+                item = {"index": index, "problem_id": request.submissions[index].problem_id}
+                if isinstance(result, ExecutionQueueFull):
+                    item["error"] = str(result)
+                elif isinstance(result, Exception):
+                    raise result
+                else:
+                    item.update(_result_dict(result))
+                yield json.dumps(item) + "\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    try:
+        results = await check_solutions_async(pairs, timeout=request.timeout)
+    except ExecutionQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
     return {
-        "is_correct": result.is_correct,
-        "message": result.message,
-        "user_output": result.user_output,
-        "expected_output": result.expected_output,
-        "details": result.details,
+        "results": [
+            dict(problem_id=submission.problem_id, **_result_dict(result))
+            for submission, result in zip(request.submissions, results)
+        ],
+        "total": len(results),
     }
@@ -1,30 +1,104 @@
 """Code execution API endpoints."""
 
-from pydantic import BaseModel
-from fastapi import APIRouter
+import asyncio
+import json
+from contextlib import suppress
+from pydantic import BaseModel, Field
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from engine.code_executor import execute_code
+from engine.async_executor import execute_code_async, stream_code_async, ExecutionQueueFull
+from engine.time_budget import get_time_budget
+from backend.core.config import settings
 
 router = APIRouter(prefix="/execute", tags=["execute"])
 
 
 class ExecuteRequest(BaseModel):
-    code: str
-    timeout: float = 5.0
+    code: str = Field(max_length=settings.MAX_CODE_LENGTH)
+    timeout: float = Field(5.0, gt=0)
 
 
 @router.post("")
 async def execute(request: ExecuteRequest):
     """Execute Python code and return the result."""
-    result = execute_code(request.code, timeout=request.timeout)
+    try:
+        result = await execute_code_async(request.code, timeout=get_time_budget().clamp(request.timeout))
+    except ExecutionQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
     
     return {
         "output": result.output,
         "error": result.error,
         "execution_time": result.execution_time,
         "success": result.success,
+        "truncated": result.truncated,
     }
+
+
+def _sse_event(event: str, data: dict) -> str:
+    """Format one Server-Sent Events frame."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _disconnected(http_request: Request) -> None:
+    """Return once the client has gone away."""
+    while (await http_request.receive())["type"] != "http.disconnect":
+        pass
+
+
+@router.post("/stream")
+async def execute_stream(request: ExecuteRequest, http_request: Request):
+    """Execute Python code, streaming its output as Server-Sent Events.
+
+    Sends `stdout` and `stderr` events with `{"text": ...}` as output is
+    produced, then a single `result` event with the error, timing and status.
+    The run is stopped as soon as the client disconnects.
+    """
+    events = stream_code_async(request.code, timeout=get_time_budget().clamp(request.timeout))
+
+    # Start the run here so a full queue is reported as a 503, not mid-stream.
+    # A silent run sends nothing until it ends, so watch for the client leaving meanwhile.
+    starting = asyncio.ensure_future(anext(events))
+    leaving = asyncio.ensure_future(_disconnected(http_request))
+    try:
+        await asyncio.wait((starting, leaving), return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        leaving.cancel()
+    if not starting.done():
+        starting.cancel()
+        with suppress(asyncio.CancelledError):
+            await starting
+        return Response(status_code=499)
+    try:
+        first = starting.result()
+    except ExecutionQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    async def frames():
+        event = first
+        try:
+            while True:
+                kind, payload = event
+                if kind == "result":
+                    yield _sse_event("result", {
+                        "error": payload.error,
+                        "execution_time": payload.execution_time,
+                        "success": payload.success,
+                        "truncated": payload.truncated,
+                    })
+                    return
+                yield _sse_event(kind, {"text": payload})
+                event = await anext(events)
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(
+        frames(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,7 +1,7 @@
 """Problems API endpoints."""
 
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 import sys
 from pathlib import Path
 
@@ -9,38 +9,85 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from problems import ProblemLoader
 from backend.core.dependencies import get_problem_loader
-from backend.services.problem_service import ProblemService
+from backend.core.response_cache import get_response_cache
+from backend.services.problem_service import InvalidPageRequest, ProblemService, parse_fields
 
 router = APIRouter(prefix="/problems", tags=["problems"])
 
 
 @router.get("")
 async def list_problems(
+    request: Request,
     category: Optional[str] = None,
     difficulty: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     loader: ProblemLoader = Depends(get_problem_loader),
 ):
-    """List all problems, optionally filtered by category and/or difficulty."""
+    """List problem summaries, optionally filtered by category and/or difficulty.
+
+    Each summary has the id, title, category, difficulty and points of a
+    problem; fetch `/problems/{problem_id}` for the rest. `fields` limits
+    summaries to a comma-separated subset such as `id,title,difficulty`.
+
+    With `limit`, one page is returned and `next_cursor` fetches the next;
+    without it, every matching problem is. Responses carry an ETag and are
+    answered with 304 when `If-None-Match` still matches.
+    """
+    service = ProblemService(loader)
+    try:
+        projection = parse_fields(fields)
+    except InvalidPageRequest as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def build():
+        try:
+            return service.get_problem_page(category, difficulty, limit, cursor, projection)
+        except InvalidPageRequest as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    key = ("problems", loader.version, category, difficulty, limit, cursor, projection)
+    return get_response_cache().respond(request, key, build)
+
+
+@router.get("/search")
+async def search_problems(
+    q: str = Query(..., min_length=1, max_length=200),
+    category: Optional[str] = None,
+    difficulty: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    loader: ProblemLoader = Depends(get_problem_loader),
+):
+    """Search problem titles, descriptions and hints, best match first.
+
+    The last word of `q` also matches words it is the start of, so partial
+    input can be searched as it is typed. Each result is a problem summary
+    with its relevance `score`.
+    """
     service = ProblemService(loader)
-    
-    if category or difficulty:
-        problems = service.filter_problems(category=category, difficulty=difficulty)
-    else:
-        problems = service.get_all_problems()
-    
-    return {"problems": problems, "total": len(problems)}
+    results = [
+        {**summary.to_dict(), "score": round(score, 4)}
+        for summary, score in service.search_problems(q, category=category, difficulty=difficulty, limit=limit)
+    ]
+    return {"query": q, "results": results, "total": len(results)}
 
 
 @router.get("/{problem_id}")
 async def get_problem(
+    request: Request,
     problem_id: str,
     loader: ProblemLoader = Depends(get_problem_loader),
 ):
-    """Get a specific problem by ID."""
+    """Get a specific problem by ID, with an ETag like the problem list."""
     service = ProblemService(loader)
-    problem = service.get_problem(problem_id)
-    
-    if problem is None:
+    if loader.get_problem_summary(problem_id) is None:
         raise HTTPException(status_code=404, detail=f"Problem {problem_id} not found")
-    
-    return problem
+
+    def build():
+        problem = service.get_problem(problem_id)
+        if problem is None:
+            raise HTTPException(status_code=404, detail=f"Problem {problem_id} not found")
+        return problem
+
+    return get_response_cache().respond(request, ("problem", loader.version, problem_id), build)
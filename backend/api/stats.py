@@ -7,7 +7,11 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from backend.core.dependencies import get_problem_loader, get_progress_manager
-from backend.services.problem_service import ProblemService
+from backend.core.response_cache import get_response_cache
+from engine.async_executor import get_check_flights
+from engine.code_cache import get_code_cache
+from engine.reference_registry import get_reference_registry
+from engine.result_cache import get_verdict_cache
 
 router = APIRouter(prefix="/stats", tags=["stats"])
 
@@ -18,42 +22,26 @@ async def get_stats(
     progress_manager = Depends(get_progress_manager),
 ):
     """Get statistics about problems and progress."""
-    service = ProblemService(loader)
-    all_problems = service.get_all_problems()
     completed_ids = progress_manager.get_completed_problems()
-    
-    # Calculate points
-    difficulty_points = {"Beginner": 1, "Intermediate": 2, "Advanced": 4}
-    total_points = sum(difficulty_points.get(p.get("difficulty", "Beginner"), 1) for p in all_problems)
-    earned_points = sum(
-        difficulty_points.get(p.get("difficulty", "Beginner"), 1)
-        for p in all_problems
-        if p["id"] in completed_ids
-    )
-    
-    # Count by difficulty
-    difficulty_counts = {}
+    completed = [p for p in map(loader.get_problem_summary, completed_ids) if p is not None]
+
+    # Count completed problems; totals come from the loader's indexes
     completed_by_difficulty = {}
-    for problem in all_problems:
-        diff = problem.get("difficulty", "Beginner")
-        difficulty_counts[diff] = difficulty_counts.get(diff, 0) + 1
-        if problem["id"] in completed_ids:
-            completed_by_difficulty[diff] = completed_by_difficulty.get(diff, 0) + 1
-    
-    # Count by category
-    category_counts = {}
     completed_by_category = {}
-    for problem in all_problems:
-        cat = problem.get("category", "Unknown")
-        category_counts[cat] = category_counts.get(cat, 0) + 1
-        if problem["id"] in completed_ids:
-            completed_by_category[cat] = completed_by_category.get(cat, 0) + 1
-    
+    for problem in completed:
+        diff = problem.difficulty
+        cat = problem.category
+        completed_by_difficulty[diff] = completed_by_difficulty.get(diff, 0) + 1
+        completed_by_category[cat] = completed_by_category.get(cat, 0) + 1
+
+    difficulty_counts = loader.get_difficulty_counts()
+    category_counts = loader.get_category_counts()
+
     return {
-        "total_problems": len(all_problems),
+        "total_problems": len(loader.get_problem_summaries()),
         "completed_problems": len(completed_ids),
-        "total_points": total_points,
-        "earned_points": earned_points,
+        "total_points": loader.total_points,
+        "earned_points": loader.get_points(completed_ids),
         "difficulty_stats": {
             diff: {
                 "total": difficulty_counts.get(diff, 0),
@@ -69,3 +57,15 @@ async def get_stats(
             for cat in category_counts.keys()
         },
     }
+
+
+@router.get("/engine")
+async def get_engine_stats():
+    """Get cache counters of the code execution engine and reference validation status."""
+    return {
+        "response_cache": get_response_cache().stats(),
+        "code_cache": get_code_cache().stats(),
+        "verdict_cache": get_verdict_cache().stats(),
+        "check_coalescing": get_check_flights().stats(),
+        "reference_solutions": get_reference_registry().stats(),
+    }
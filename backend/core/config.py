@@ -1,5 +1,6 @@
 """Configuration settings for the FastAPI backend."""
 
+import os
 from pathlib import Path
 
 
@@ -18,6 +19,27 @@ class Settings:
     # Project paths
     PROJECT_ROOT = Path(__file__).parent.parent.parent
     PROBLEMS_DIR = PROJECT_ROOT / "problems"
+    
+    # Execution Settings
+    EXECUTION_WORKERS = int(os.environ.get("PYTHON_COACH_WORKERS", os.cpu_count() or 1))
+    EXECUTION_CPU_SECONDS = float(os.environ.get("PYTHON_COACH_CPU_SECONDS", 0)) or None
+    EXECUTION_MEMORY_MB = int(os.environ.get("PYTHON_COACH_MEMORY_MB", 0)) or None
+    EXECUTION_MAX_OUTPUT_BYTES = int(os.environ.get("PYTHON_COACH_MAX_OUTPUT_BYTES", 64 * 1024))
+    EXECUTION_MAX_CONCURRENCY = int(os.environ.get("PYTHON_COACH_MAX_CONCURRENCY", 0)) or EXECUTION_WORKERS or 1
+    EXECUTION_QUEUE_SIZE = int(os.environ.get("PYTHON_COACH_QUEUE_SIZE", 100))
+    MAX_CODE_LENGTH = int(os.environ.get("PYTHON_COACH_MAX_CODE_LENGTH", 64 * 1024))
+    CHECK_BATCH_MAX_SIZE = int(os.environ.get("PYTHON_COACH_BATCH_MAX_SIZE", 1000))
+    VALIDATE_REFERENCE_SOLUTIONS = os.environ.get("PYTHON_COACH_VALIDATE_REFERENCES", "1") != "0"
+    REFERENCE_RUNS = int(os.environ.get("PYTHON_COACH_REFERENCE_RUNS", 5))
+    TIMEOUT_MULTIPLIER = float(os.environ.get("PYTHON_COACH_TIMEOUT_MULTIPLIER", 20.0))
+    TIMEOUT_FLOOR = float(os.environ.get("PYTHON_COACH_TIMEOUT_FLOOR", 1.0))
+    TIMEOUT_CEILING = float(os.environ.get("PYTHON_COACH_TIMEOUT_CEILING", 10.0))
+    PROBLEMS_RELOAD_INTERVAL = float(os.environ.get("PYTHON_COACH_RELOAD_INTERVAL", 2.0))
+    RESPONSE_CACHE_SIZE = int(os.environ.get("PYTHON_COACH_RESPONSE_CACHE_SIZE", 4096))
+    RESPONSE_GZIP = os.environ.get("PYTHON_COACH_RESPONSE_GZIP", "1") != "0"
+    PROGRESS_WRITE_BEHIND = os.environ.get("PYTHON_COACH_PROGRESS_WRITE_BEHIND", "1") != "0"
+    PROGRESS_FLUSH_INTERVAL = float(os.environ.get("PYTHON_COACH_PROGRESS_FLUSH_INTERVAL", 1.0))
+    PROGRESS_FLUSH_THRESHOLD = int(os.environ.get("PYTHON_COACH_PROGRESS_FLUSH_THRESHOLD", 50))
 
 
 settings = Settings()
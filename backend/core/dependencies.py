@@ -8,6 +8,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from problems import ProblemLoader
 from engine.progress_manager import ProgressManager
+from backend.core.config import settings
 
 # Singleton instances
 _problem_loader: ProblemLoader | None = None
@@ -26,5 +27,9 @@ def get_progress_manager() -> ProgressManager:
     """Get or create ProgressManager instance."""
     global _progress_manager
     if _progress_manager is None:
-        _progress_manager = ProgressManager()
+        _progress_manager = ProgressManager(
+            write_behind=settings.PROGRESS_WRITE_BEHIND,
+            flush_interval=settings.PROGRESS_FLUSH_INTERVAL,
+            max_dirty=settings.PROGRESS_FLUSH_THRESHOLD,
+        )
     return _progress_manager
@@ -0,0 +1,180 @@
+"""Pre-serialized responses for read-mostly endpoints.
+
+The problem endpoints return the same data until the library is
+reloaded, so each response variant is serialized once and its bytes kept,
+together with a gzip-compressed copy and a strong ETag derived from the
+content. A request whose If-None-Match names the current ETag gets an
+empty 304, and any other gets the cached bytes without serializing again.
+
+Callers key entries on the problem loader's version, so an entry built
+from old data is never served after a reload; the backend also clears the
+cache on reload to free the memory.
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """The serialized body of a response variant and its validators."""
+
+    body: bytes
+    etag: str
+    gzipped: Optional[bytes] = None
+    gzipped_etag: Optional[str] = None
+
+
+def serialize(content: Any) -> bytes:
+    """Serialize content the way FastAPI's default JSON response does."""
+    return json.dumps(
+        jsonable_encoder(content),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def _accepts_gzip(request: Request) -> bool:
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, *params = coding.split(";")
+        if name.strip().lower() != "gzip":
+            continue
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    return float(value) > 0
+                except ValueError:
+                    return False
+        return True
+    return False
+
+
+def _matches(if_none_match: str, etags: tuple[str, ...]) -> bool:
+    """Whether an If-None-Match header names any of etags, using weak comparison."""
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag in etags:
+            return True
+    return False
+
+
+class ResponseCache:
+    """Bounded LRU cache of serialized JSON responses."""
+
+    def __init__(self, max_entries: int = 4096, gzip_min_size: int = 1024, gzip_enabled: bool = True):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of response variants to keep.
+            gzip_min_size: Smallest body, in bytes, that is also kept compressed.
+            gzip_enabled: Whether to keep compressed bodies at all.
+        """
+        self.max_entries = max_entries
+        self.gzip_min_size = gzip_min_size
+        self.gzip_enabled = gzip_enabled
+        self._entries: OrderedDict[Hashable, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def get(self, key: Hashable, build: Callable[[], Any]) -> CachedResponse:
+        """Return the cached response for key, serializing build() on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        body = serialize(build())
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        gzipped = gzipped_etag = None
+        if self.gzip_enabled and len(body) >= self.gzip_min_size:
+            gzipped = gzip.compress(body, mtime=0)
+            gzipped_etag = f'"{digest}-gzip"'
+        entry = CachedResponse(body, f'"{digest}"', gzipped, gzipped_etag)
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def respond(self, request: Request, key: Hashable, build: Callable[[], Any]) -> Response:
+        """
+        Answer a GET request from the cache.
+
+        Args:
+            request: The incoming request, for its If-None-Match and Accept-Encoding
+            key: Identifies the response variant; include everything the content depends on
+            build: Returns the content to serialize on a miss
+
+        Returns:
+            A 304 if the client's copy is current, otherwise the JSON body,
+            compressed if the client accepts gzip and a compressed copy is kept
+        """
+        entry = self.get(key, build)
+        headers = {"Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        use_gzip = entry.gzipped is not None and _accepts_gzip(request)
+        headers["ETag"] = entry.gzipped_etag if use_gzip else entry.etag
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _matches(if_none_match, (entry.etag, entry.gzipped_etag)):
+            with self._lock:
+                self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+
+        if use_gzip:
+            headers["Content-Encoding"] = "gzip"
+            return Response(entry.gzipped, media_type="application/json", headers=headers)
+        return Response(entry.body, media_type="application/json", headers=headers)
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Return cache counters for monitoring."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+            }
+
+
+_cache = ResponseCache()
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Get the shared response cache."""
+    return _cache
+
+
+def configure_response_cache(max_entries: int, gzip_enabled: bool) -> ResponseCache:
+    """Replace the shared response cache."""
+    global _cache
+    with _cache_lock:
+        _cache = ResponseCache(max_entries=max_entries, gzip_enabled=gzip_enabled)
+        return _cache
@@ -1,14 +1,80 @@
 """FastAPI application entry point."""
 
+import threading
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from backend.core.config import settings
 from backend.api import problems, execute, check, progress, stats
+from backend.core.dependencies import get_problem_loader, get_progress_manager
+from backend.core.response_cache import configure_response_cache, get_response_cache
+from engine.async_executor import configure_execution_gate
+from engine.reference import validate_references
+from engine.reference_registry import get_reference_registry
+from engine.result_cache import get_verdict_cache
+from engine.sandbox import ExecutionLimits
+from engine.time_budget import configure_time_budget
+from engine.worker_pool import start_worker_pool, shutdown_worker_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the execution worker pool before serving and stop it on shutdown.
+
+    Reference solutions are validated in the background once the pool is up.
+    The problem library is watched for changes; when it is reloaded, cached
+    responses, verdicts and reference results of the changed problems are
+    dropped and their reference solutions validated again. Pending progress
+    is saved on shutdown.
+    """
+    limits = ExecutionLimits(
+        cpu_seconds=settings.EXECUTION_CPU_SECONDS,
+        memory_bytes=settings.EXECUTION_MEMORY_MB * 1024 * 1024 if settings.EXECUTION_MEMORY_MB else None,
+        max_output_bytes=settings.EXECUTION_MAX_OUTPUT_BYTES,
+    )
+    start_worker_pool(settings.EXECUTION_WORKERS, limits)
+    configure_execution_gate(settings.EXECUTION_MAX_CONCURRENCY, settings.EXECUTION_QUEUE_SIZE)
+    configure_time_budget(settings.TIMEOUT_MULTIPLIER, settings.TIMEOUT_FLOOR, settings.TIMEOUT_CEILING)
+    configure_response_cache(settings.RESPONSE_CACHE_SIZE, settings.RESPONSE_GZIP)
+
+    loader = get_problem_loader()
+    stop_validation = threading.Event()
+
+    def validate(problems: list[dict]) -> None:
+        get_reference_registry().register(problems)
+        if settings.VALIDATE_REFERENCE_SOLUTIONS and problems:
+            threading.Thread(
+                target=validate_references,
+                args=(problems, settings.REFERENCE_RUNS),
+                kwargs={"stop": stop_validation},
+                name="reference-validation",
+                daemon=True,
+            ).start()
+
+    def on_reload(changed: set[str]) -> None:
+        get_response_cache().clear()
+        verdict_cache = get_verdict_cache()
+        for problem_id in changed:
+            verdict_cache.invalidate(problem_id)
+        get_reference_registry().forget(changed)
+        validate([p for p in map(loader.get_problem_by_id, sorted(changed)) if p is not None])
+
+    validate(loader.get_all_problems())
+    loader.add_reload_listener(on_reload)
+    if settings.PROBLEMS_RELOAD_INTERVAL > 0:
+        loader.start_watching(settings.PROBLEMS_RELOAD_INTERVAL)
+    yield
+    get_progress_manager().close()
+    loader.stop_watching()
+    stop_validation.set()
+    shutdown_worker_pool()
+
 
 app = FastAPI(
     title="Python Coach API",
     description="REST API for Python Coach learning platform",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware
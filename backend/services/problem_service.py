@@ -1,7 +1,45 @@
 """Problem service layer."""
 
+import base64
+import binascii
+from dataclasses import fields
 from typing import Optional
-from problems import ProblemLoader
+from problems import ProblemLoader, ProblemSummary
+
+# Fields a problem list can be projected to
+SUMMARY_FIELDS = tuple(field.name for field in fields(ProblemSummary))
+
+
+class InvalidPageRequest(ValueError):
+    """Raised for an unknown projection field or a cursor that cannot be resumed."""
+    pass
+
+
+def encode_cursor(offset: int, last_id: str) -> str:
+    """Encode where a page ended: its end offset and the id of its last problem."""
+    return base64.urlsafe_b64encode(f"{offset}:{last_id}".encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[int, str]:
+    """Decode a cursor made by encode_cursor."""
+    try:
+        offset, _, last_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").partition(":")
+        return int(offset), last_id
+    except (binascii.Error, UnicodeError, ValueError):
+        raise InvalidPageRequest("Invalid cursor") from None
+
+
+def parse_fields(fields_param: Optional[str]) -> Optional[tuple[str, ...]]:
+    """Parse a comma-separated fields= projection; None keeps every field."""
+    if not fields_param:
+        return None
+    requested = tuple(dict.fromkeys(name.strip() for name in fields_param.split(",") if name.strip()))
+    unknown = [name for name in requested if name not in SUMMARY_FIELDS]
+    if unknown or not requested:
+        raise InvalidPageRequest(
+            f"Unknown field(s) {', '.join(unknown) or repr(fields_param)}; choose from {', '.join(SUMMARY_FIELDS)}"
+        )
+    return requested
 
 
 class ProblemService:
@@ -14,6 +52,71 @@ class ProblemService:
         """Get all problems."""
         return self.loader.get_all_problems()
     
+    def get_problem_summaries(
+        self,
+        category: Optional[str] = None,
+        difficulty: Optional[str] = None
+    ):
+        """Get problem summaries, optionally filtered by category and/or difficulty."""
+        return self.loader.get_problem_summaries(category=category, difficulty=difficulty)
+    
+    def search_problems(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        limit: int = 20
+    ):
+        """Search problems by title, description and hints, best match first."""
+        return self.loader.search(query, category=category, difficulty=difficulty, limit=limit)
+    
+    def get_problem_page(
+        self,
+        category: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[tuple[str, ...]] = None
+    ) -> dict:
+        """
+        Get one page of problem summaries, optionally projected to some fields.
+
+        Pages are slices of the loader's prebuilt filter lists, so a page
+        costs the same however large the library is. A cursor records the
+        page's end offset and last problem id; if a reload has since moved
+        that problem, the cursor is refused rather than skipping or
+        repeating problems.
+
+        Args:
+            category: Only problems in this category, if given and not "All"
+            difficulty: Only problems of this difficulty level, if given and not "All"
+            limit: Most problems per page; all remaining problems if None
+            cursor: The next_cursor of the previous page, or None for the first page
+            fields: Summary fields to include; every field if None
+
+        Returns:
+            A dict with the page's problems, the total number of matching
+            problems and the next_cursor, which is None on the last page
+
+        Raises:
+            InvalidPageRequest: If the cursor is malformed or no longer valid
+        """
+        summaries = self.loader.get_problem_summaries(category=category, difficulty=difficulty)
+        start = 0
+        if cursor:
+            start, last_id = decode_cursor(cursor)
+            if not 0 < start <= len(summaries) or summaries[start - 1].id != last_id:
+                raise InvalidPageRequest("Cursor is no longer valid; start again from the first page")
+        end = len(summaries) if limit is None else min(start + limit, len(summaries))
+        page = summaries[start:end]
+
+        if fields is None:
+            problems = page
+        else:
+            problems = [{name: getattr(summary, name) for name in fields} for summary in page]
+        next_cursor = encode_cursor(end, page[-1].id) if page and end < len(summaries) else None
+        return {"problems": problems, "total": len(summaries), "next_cursor": next_cursor}
+    
     def get_problem(self, problem_id: str):
         """Get a specific problem by ID."""
         return self.loader.get_problem_by_id(problem_id)
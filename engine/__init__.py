@@ -3,6 +3,14 @@
 from .code_executor import execute_code
 from .solution_checker import check_solution
 from .progress_manager import ProgressManager
+from .async_executor import execute_code_async, check_solution_async, ExecutionQueueFull
 
-__all__ = ["execute_code", "check_solution", "ProgressManager"]
+__all__ = [
+    "execute_code",
+    "check_solution",
+    "ProgressManager",
+    "execute_code_async",
+    "check_solution_async",
+    "ExecutionQueueFull",
+]
 
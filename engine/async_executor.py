@@ -0,0 +1,253 @@
+"""Awaitable code execution for async web handlers.
+
+Execution itself is blocking (the calling thread waits on a worker
+process), so it is moved off the event loop onto a dedicated thread pool.
+An ExecutionGate bounds how many runs are in flight and how many callers
+may wait for a slot, so a burst of slow submissions cannot stall the event
+loop or pile up unbounded work.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing, asynccontextmanager
+from functools import partial
+from typing import AsyncIterator, Callable, Iterator, Optional, TypeVar, Union
+
+from .coalesce import SingleFlight
+from .code_executor import ExecutionResult, execute_code, stream_code
+from .result_cache import get_verdict_cache
+from .sandbox import ExecutionLimits
+from .solution_checker import CheckResult, check_solution
+from .time_budget import get_time_budget
+from .worker_pool import Cancellation, get_worker_pool
+
+T = TypeVar("T")
+
+
+class ExecutionQueueFull(Exception):
+    """Raised when too many executions are already waiting for a slot."""
+
+    pass
+
+
+class ExecutionGate:
+    """Runs blocking execution calls off the event loop with bounded concurrency."""
+
+    def __init__(self, max_concurrent: int, max_waiting: int = 100):
+        """Initialize the gate.
+
+        Args:
+            max_concurrent: Maximum number of executions running at once.
+            max_waiting: Maximum number of callers waiting for a free slot.
+        """
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_waiting = max(0, max_waiting)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrent, thread_name_prefix="execution"
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._waiting = 0
+
+    @property
+    def waiting(self) -> int:
+        """Number of callers currently waiting for a slot."""
+        return self._waiting
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get the semaphore bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._loop = loop
+        return self._semaphore
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one of the execution slots for the duration of the block.
+
+        Raises:
+            ExecutionQueueFull: If all slots are busy and the wait queue is full.
+        """
+        semaphore = self._get_semaphore()
+        if semaphore.locked() and self._waiting >= self.max_waiting:
+            raise ExecutionQueueFull(
+                f"Too many submissions are waiting to run ({self._waiting}). Try again shortly."
+            )
+
+        self._waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+    async def run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Run a blocking call once a slot is free.
+
+        Raises:
+            ExecutionQueueFull: If all slots are busy and the wait queue is full.
+        """
+        async with self.slot():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    async def iterate(
+        self, iterator_factory: Callable[..., Iterator], *args, on_stop: Optional[Callable[[], None]] = None
+    ) -> AsyncIterator:
+        """Drain a blocking iterator on the gate's threads once a slot is free.
+
+        Items are handed to the event loop as soon as they are produced. If the
+        consumer stops early, the iterator is closed after its current item,
+        and on_stop is called right away so it can stop whatever the iterator
+        is waiting on.
+
+        Raises:
+            ExecutionQueueFull: If all slots are busy and the wait queue is full.
+        """
+        async with self.slot():
+            loop = asyncio.get_running_loop()
+            items: asyncio.Queue = asyncio.Queue()
+            done = object()
+            cancelled = threading.Event()
+
+            def pump() -> None:
+                iterator = iterator_factory(*args)
+                try:
+                    for item in iterator:
+                        loop.call_soon_threadsafe(items.put_nowait, item)
+                        if cancelled.is_set():
+                            break
+                finally:
+                    iterator.close()
+                    loop.call_soon_threadsafe(items.put_nowait, done)
+
+            pumping = loop.run_in_executor(self._executor, pump)
+            finished = False
+            try:
+                while (item := await items.get()) is not done:
+                    yield item
+                finished = True
+            finally:
+                cancelled.set()
+                if not finished and on_stop is not None:
+                    on_stop()
+            await pumping
+
+    def shutdown(self) -> None:
+        """Stop the gate's thread pool."""
+        self._executor.shutdown(wait=False)
+
+
+_gate: Optional[ExecutionGate] = None
+_gate_lock = threading.Lock()
+
+
+def get_execution_gate() -> ExecutionGate:
+    """Get the shared execution gate, sized to the worker pool by default."""
+    global _gate
+    with _gate_lock:
+        if _gate is None:
+            _gate = ExecutionGate(get_worker_pool().size or 1)
+        return _gate
+
+
+def configure_execution_gate(max_concurrent: int, max_waiting: int = 100) -> ExecutionGate:
+    """Replace the shared execution gate with one using the given bounds."""
+    global _gate
+    with _gate_lock:
+        if _gate is not None:
+            _gate.shutdown()
+        _gate = ExecutionGate(max_concurrent, max_waiting)
+        return _gate
+
+
+async def execute_code_async(
+    code: str, timeout: float = 5.0, limits: Optional[ExecutionLimits] = None
+) -> ExecutionResult:
+    """
+    Awaitable version of execute_code.
+
+    Args:
+        code: The Python code to execute
+        timeout: Maximum execution time in seconds (default: 5.0)
+        limits: Optional CPU-seconds, address-space and output-size limits for this run
+
+    Returns:
+        ExecutionResult with output, error info, and execution status
+
+    Raises:
+        ExecutionQueueFull: If too many executions are already waiting
+    """
+    return await get_execution_gate().run(execute_code, code, timeout, limits)
+
+
+async def stream_code_async(
+    code: str, timeout: float = 5.0, limits: Optional[ExecutionLimits] = None
+) -> AsyncIterator[tuple[str, Union[str, ExecutionResult]]]:
+    """
+    Awaitable version of stream_code.
+
+    Args:
+        code: The Python code to execute
+        timeout: Maximum execution time in seconds (default: 5.0)
+        limits: Optional CPU-seconds, address-space and output-size limits for this run
+
+    Yields:
+        ("stdout", text) and ("stderr", text) chunks as they are produced,
+        then ("result", ExecutionResult) once the run is over
+
+    Raises:
+        ExecutionQueueFull: If too many executions are already waiting
+    """
+    # A consumer that stops early, e.g. on client disconnect, kills the run
+    # instead of leaving it to the timeout
+    cancel = Cancellation()
+    events = get_execution_gate().iterate(stream_code, code, timeout, limits, cancel, on_stop=cancel.cancel)
+    async with aclosing(events):
+        async for event in events:
+            yield event
+
+
+_check_flights = SingleFlight()
+
+
+def get_check_flights() -> SingleFlight:
+    """Get the coalescer shared by concurrent checks."""
+    return _check_flights
+
+
+async def check_solution_async(user_code: str, problem: dict, timeout: float = 5.0) -> CheckResult:
+    """
+    Awaitable version of check_solution.
+
+    Concurrent checks of the same submission to the same problem wait on a
+    single execution and share its result.
+
+    Args:
+        user_code: The user's submitted code
+        problem: The problem dictionary containing expected output/test cases
+        timeout: Requested execution timeout in seconds, capped at the problem's time budget
+
+    Returns:
+        CheckResult with correctness status and feedback
+
+    Raises:
+        ExecutionQueueFull: If too many executions are already waiting
+    """
+    # Clamped before keying, so requests that differ only in timeout still coalesce
+    timeout = get_time_budget().clamp(timeout, problem.get("id"))
+
+    def run_check():
+        return get_execution_gate().run(check_solution, user_code, problem, timeout)
+
+    # Keyed on the exact text, as the shared verdict may quote line numbers.
+    # Hashing a long submission takes a while, so it is done off the event loop.
+    key = await asyncio.to_thread(get_verdict_cache().key_for, user_code, problem, exact=True)
+    if key is None:
+        return await run_check()
+    return await _check_flights.do((key, timeout), run_check)
@@ -0,0 +1,121 @@
+"""Grading many submissions at once, fanned out across the worker pool."""
+
+import asyncio
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import AsyncIterator, Iterable, Iterator, Union
+
+from .async_executor import check_solution_async, get_execution_gate
+from .solution_checker import CheckResult, check_solution
+from .worker_pool import get_worker_pool
+
+
+def iter_check_solutions(
+    submissions: Iterable[tuple[str, dict]], timeout: float = 5.0
+) -> Iterator[tuple[int, CheckResult]]:
+    """
+    Check submissions in parallel, yielding results as they complete.
+
+    Only about two submissions per worker are scheduled at a time, so when
+    the caller stops early, e.g. on Ctrl+C, nothing but the checks already
+    running has to finish.
+
+    Args:
+        submissions: (user_code, problem) pairs
+        timeout: Execution timeout in seconds for each submission
+
+    Yields:
+        (index, CheckResult) pairs in completion order
+    """
+    workers = get_worker_pool().size or 1
+    remaining = enumerate(submissions)
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch")
+    try:
+        futures = {}
+
+        def schedule(count: int) -> None:
+            for index, (code, problem) in islice(remaining, count):
+                futures[executor.submit(check_solution, code, problem, timeout)] = index
+
+        schedule(2 * workers)
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            schedule(len(done))
+            for future in done:
+                yield futures.pop(future), future.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def check_solutions(submissions: Iterable[tuple[str, dict]], timeout: float = 5.0) -> list[CheckResult]:
+    """
+    Check submissions in parallel, returning results in submission order.
+
+    Args:
+        submissions: (user_code, problem) pairs
+        timeout: Execution timeout in seconds for each submission
+
+    Returns:
+        List of CheckResult, one per submission
+    """
+    submissions = list(submissions)
+    results: list = [None] * len(submissions)
+    for index, result in iter_check_solutions(submissions, timeout):
+        results[index] = result
+    return results
+
+
+async def iter_check_solutions_async(
+    submissions: list[tuple[str, dict]], timeout: float = 5.0, return_exceptions: bool = False
+) -> AsyncIterator[tuple[int, Union[CheckResult, Exception]]]:
+    """
+    Awaitable version of iter_check_solutions.
+
+    A batch only keeps as many checks queued as the execution gate runs at
+    once, so a large batch cannot fill the wait queue for other requests.
+
+    Args:
+        submissions: (user_code, problem) pairs
+        timeout: Execution timeout in seconds for each submission
+        return_exceptions: Yield a failed check's exception, such as
+            ExecutionQueueFull, in place of its result instead of raising it
+
+    Yields:
+        (index, CheckResult) pairs in completion order
+    """
+    limit = asyncio.Semaphore(get_execution_gate().max_concurrent)
+
+    async def check(index: int, code: str, problem: dict) -> tuple[int, Union[CheckResult, Exception]]:
+        async with limit:
+            try:
+                return index, await check_solution_async(code, problem, timeout)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                return index, e
+
+    tasks = [
+        asyncio.ensure_future(check(index, code, problem))
+        for index, (code, problem) in enumerate(submissions)
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def check_solutions_async(
+    submissions: list[tuple[str, dict]], timeout: float = 5.0
+) -> list[CheckResult]:
+    """
+    Awaitable version of check_solutions.
+
+    Returns:
+        List of CheckResult, one per submission, in submission order
+    """
+    results: list = [None] * len(submissions)
+    async for index, result in iter_check_solutions_async(submissions, timeout):
+        results[index] = result
+    return results
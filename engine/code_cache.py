@@ -0,0 +1,97 @@
+"""Content-addressed cache of compiled user code.
+
+Sources are compiled once in the server process and kept as marshalled
+bytecode, keyed by a hash of the source text. Workers receive the bytecode
+and only have to unmarshal it, so reference solutions and unchanged
+starter code are not parsed and compiled again on every run.
+"""
+
+import hashlib
+import marshal
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class CodeCache:
+    """Bounded LRU cache of marshalled code objects keyed by source hash."""
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 16 * 1024 * 1024):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of compiled sources to keep.
+            max_bytes: Maximum total size of the kept bytecode.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # source hash -> (marshalled code, seconds it took to compile)
+        self._entries: OrderedDict[bytes, tuple[bytes, float]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.compile_seconds = 0.0
+        self.compile_seconds_saved = 0.0
+
+    def get(self, source: str) -> Optional[bytes]:
+        """Return marshalled bytecode for source, compiling it on a miss.
+
+        Returns None if the source does not compile; running it will then
+        report the error in the usual way.
+        """
+        key = hashlib.sha256(source.encode("utf-8", "surrogatepass")).digest()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self.compile_seconds_saved += entry[1]
+                return entry[0]
+            self.misses += 1
+
+        start_time = time.perf_counter()
+        try:
+            bytecode = marshal.dumps(compile(source, "<string>", "exec"))
+        except (SyntaxError, ValueError, RecursionError, MemoryError, OverflowError):
+            return None
+        elapsed = time.perf_counter() - start_time
+
+        with self._lock:
+            self.compile_seconds += elapsed
+            if key not in self._entries and len(bytecode) <= self.max_bytes:
+                self._entries[key] = (bytecode, elapsed)
+                self._size += len(bytecode)
+                while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                    _, (evicted, _) = self._entries.popitem(last=False)
+                    self._size -= len(evicted)
+        return bytecode
+
+    def clear(self) -> None:
+        """Drop all cached bytecode."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict:
+        """Return hit-rate and size counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "compile_seconds": self.compile_seconds,
+                "compile_seconds_saved": self.compile_seconds_saved,
+            }
+
+
+_cache = CodeCache()
+
+
+def get_code_cache() -> CodeCache:
+    """Get the shared compiled-code cache."""
+    return _cache
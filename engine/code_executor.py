@@ -1,21 +1,32 @@
 """Code execution engine with timeout protection for Python Coach."""
 
-import sys
-import io
-import threading
-import traceback
+from contextlib import closing
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterator, Optional, Union
+
+from .sandbox import ExecutionLimits
+from .worker_pool import Cancellation, get_worker_pool
 
 
 @dataclass
 class ExecutionResult:
-    """Result of code execution."""
+    """Result of code execution.
+
+    `interrupted` is set when the run was stopped from outside (timeout or
+    a worker failure) rather than ending on its own, so the outcome may
+    depend on server load. `case_results` holds the function test reports
+    of execute_with_cases. `output_mismatch` is set when a run given an
+    expected output was stopped because its output ran past it.
+    """
 
     output: str
     error: Optional[str]
     execution_time: float
     success: bool
+    truncated: bool = False
+    interrupted: bool = False
+    case_results: Optional[list[dict]] = None
+    output_mismatch: bool = False
 
 
 class TimeoutException(Exception):
@@ -24,86 +35,91 @@ class TimeoutException(Exception):
     pass
 
 
-def execute_code(code: str, timeout: float = 5.0) -> ExecutionResult:
+def execute_code(
+    code: str,
+    timeout: float = 5.0,
+    limits: Optional[ExecutionLimits] = None,
+    expected_output: Optional[str] = None,
+) -> ExecutionResult:
     """
     Execute Python code safely with timeout protection.
 
+    The code runs on one of the pre-forked worker processes of the shared
+    worker pool, so concurrent submissions do not compete for one GIL. A run
+    that exceeds its timeout is stopped by killing its worker.
+
     Args:
         code: The Python code to execute
         timeout: Maximum execution time in seconds (default: 5.0)
+        limits: Optional CPU-seconds, address-space and output-size limits for this run
+        expected_output: Optional normalized output; the run is stopped as soon
+            as its output runs past it, with output_mismatch set
 
     Returns:
         ExecutionResult with output, error info, and execution status
     """
-    output_capture = io.StringIO()
-    error_capture = io.StringIO()
-    result = {"output": "", "error": None, "success": False, "execution_time": 0.0}
-
-    def run_code():
-        """Inner function to run code in a thread."""
-        import time
-
-        start_time = time.time()
-        old_stdout = sys.stdout
-        old_stderr = sys.stderr
-
-        try:
-            sys.stdout = output_capture
-            sys.stderr = error_capture
-
-            # Create a restricted global namespace
-            exec_globals = {
-                "__builtins__": __builtins__,
-                "__name__": "__main__",
-            }
-
-            # Execute the code
-            exec(code, exec_globals)
-
-            result["output"] = output_capture.getvalue()
-            result["success"] = True
-
-        except Exception as e:
-            result["error"] = f"{type(e).__name__}: {str(e)}"
-            result["output"] = output_capture.getvalue()
-            # Add traceback for debugging (simplified)
-            tb_lines = traceback.format_exc().split("\n")
-            # Filter to show relevant lines
-            relevant_lines = []
-            for line in tb_lines:
-                if '<string>' in line or not line.startswith('  File'):
-                    relevant_lines.append(line)
-            result["error"] = "\n".join(relevant_lines).strip()
-
-        finally:
-            sys.stdout = old_stdout
-            sys.stderr = old_stderr
-            result["execution_time"] = time.time() - start_time
-
-    # Run code in a thread with timeout
-    thread = threading.Thread(target=run_code)
-    thread.daemon = True
-    thread.start()
-    thread.join(timeout)
-
-    if thread.is_alive():
-        # Code is still running - timeout occurred
-        return ExecutionResult(
-            output=output_capture.getvalue(),
-            error=f"Timeout: Code execution exceeded {timeout} seconds. Possible infinite loop?",
-            execution_time=timeout,
-            success=False,
-        )
-
-    return ExecutionResult(
-        output=result["output"],
-        error=result["error"],
-        execution_time=result["execution_time"],
-        success=result["success"],
-    )
-
-
-def execute_with_input(code: str, input_data: str = "", timeout: float = 5.0) -> ExecutionResult:
+    pool = get_worker_pool()
+    return ExecutionResult(**pool.run(code, timeout, limits, expected_output=expected_output))
+
+
+def stream_code(
+    code: str,
+    timeout: float = 5.0,
+    limits: Optional[ExecutionLimits] = None,
+    cancel: Optional[Cancellation] = None,
+) -> Iterator[tuple[str, Union[str, ExecutionResult]]]:
+    """
+    Execute Python code, yielding its output while it runs.
+
+    Args:
+        code: The Python code to execute
+        timeout: Maximum execution time in seconds (default: 5.0)
+        limits: Optional CPU-seconds, address-space and output-size limits for this run
+        cancel: Optional handle another thread can use to stop the run
+
+    Yields:
+        ("stdout", text) and ("stderr", text) chunks as they are produced,
+        then ("result", ExecutionResult) once the run is over
+    """
+    with closing(get_worker_pool().stream(code, timeout, limits, cancel=cancel)) as events:
+        for kind, payload in events:
+            if kind == "result":
+                payload = ExecutionResult(**payload)
+            yield kind, payload
+
+
+def execute_with_cases(
+    code: str,
+    calls: list[dict],
+    timeout: float = 5.0,
+    limits: Optional[ExecutionLimits] = None,
+    full_report: bool = False,
+) -> ExecutionResult:
+    """
+    Execute Python code once, then call its functions against many cases.
+
+    The code is compiled and run once on a single worker, and every case is
+    called in the namespace it leaves behind, all within the same timeout.
+
+    Args:
+        code: The Python code to execute
+        calls: Call groups such as {"function": "add", "cases": [{"args": [1, 2], "expected": 3}]}
+        timeout: Maximum execution time in seconds for the run and all cases
+        limits: Optional CPU-seconds, address-space and output-size limits for this run
+        full_report: Whether to run every case instead of stopping at the first failure
+
+    Returns:
+        ExecutionResult whose case_results holds one report per call group
+    """
+    return ExecutionResult(**get_worker_pool().run(code, timeout, limits, calls, full_report))
+
+
+def execute_with_input(
+    code: str,
+    input_data: str = "",
+    timeout: float = 5.0,
+    limits: Optional[ExecutionLimits] = None,
+) -> ExecutionResult:
     """
     Execute Python code with simulated input.
 
@@ -111,6 +127,7 @@ def execute_with_input(code: str, input_data: str = "", timeout: float = 5.0) ->
         code: The Python code to execute
         input_data: Simulated input (newline-separated for multiple inputs)
         timeout: Maximum execution time in seconds
+        limits: Optional CPU-seconds, address-space and output-size limits for this run
 
     Returns:
         ExecutionResult with output, error info, and execution status
@@ -136,5 +153,5 @@ def _mock_input(prompt=''):
 input = _mock_input
 """
     modified_code = input_setup + "\n" + code
-    return execute_code(modified_code, timeout)
+    return execute_code(modified_code, timeout, limits)
 
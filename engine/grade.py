@@ -0,0 +1,195 @@
+"""Offline bulk grader for stored submissions.
+
+Usage:
+    python -m engine.grade SUBMISSIONS OUTPUT [--workers N] [--timeout S]
+
+SUBMISSIONS is either a JSONL file with one {"id", "problem_id", "code"}
+object per line, or a directory laid out as <problem_id>/<name>.py. Each
+verdict is appended to OUTPUT as one JSON line. OUTPUT doubles as the
+checkpoint: re-running the same command skips submissions that already
+have a verdict, so an interrupted run resumes where it stopped.
+"""
+
+import argparse
+import json
+import os
+import sys
+from contextlib import closing
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, Optional
+
+from problems import ProblemLoader
+
+from .batch import iter_check_solutions
+from .worker_pool import start_worker_pool, shutdown_worker_pool
+
+
+def iter_submissions(source: Path) -> Iterator[dict]:
+    """Yield {"id", "problem_id", "code"} records from a JSONL file or directory."""
+    if source.is_dir():
+        for path in sorted(source.glob("*/*.py")):
+            yield {
+                "id": f"{path.parent.name}/{path.stem}",
+                "problem_id": path.parent.name,
+                "code": path.read_text(encoding="utf-8"),
+            }
+        return
+
+    with open(source, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            record.setdefault("id", str(line_number))
+            yield record
+
+
+def load_checkpoint(output: Path) -> set[str]:
+    """Return the ids of submissions that already have a verdict in output."""
+    done = set()
+    if not output.exists():
+        return done
+    with open(output, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                done.add(str(json.loads(line)["id"]))
+            except (json.JSONDecodeError, KeyError):
+                # A partial last line from an interrupted run
+                continue
+    return done
+
+
+def _truncate_partial_line(output: Path) -> None:
+    """Drop an unfinished last line so new verdicts start on a line of their own."""
+    if not output.exists():
+        return
+    with open(output, "rb+") as f:
+        data_end = f.seek(0, os.SEEK_END)
+        if data_end == 0:
+            return
+        f.seek(data_end - 1)
+        if f.read(1) == b"\n":
+            return
+        position = data_end
+        while position > 0:
+            step = min(4096, position)
+            f.seek(position - step)
+            chunk = f.read(step)
+            newline = chunk.rfind(b"\n")
+            if newline != -1:
+                f.truncate(position - step + newline + 1)
+                return
+            position -= step
+        f.truncate(0)
+
+
+def grade(
+    source: Path,
+    output: Path,
+    timeout: float = 5.0,
+    chunk_size: int = 1000,
+    fsync_every: int = 100,
+) -> dict:
+    """
+    Grade every submission in source that has no verdict in output yet.
+
+    Args:
+        source: JSONL file or directory of submissions
+        output: JSONL file receiving verdicts, also used as the checkpoint
+        timeout: Execution timeout in seconds for each submission
+        chunk_size: Submissions read at a time
+        fsync_every: Verdicts written between forced flushes to disk
+
+    Returns:
+        Counts of graded, correct and skipped submissions
+    """
+    loader = ProblemLoader()
+    done = load_checkpoint(output)
+    _truncate_partial_line(output)
+    counts = {"graded": 0, "correct": 0, "skipped": 0, "unknown_problem": 0}
+
+    pending = (s for s in iter_submissions(source) if str(s["id"]) not in done)
+    with open(output, "a", encoding="utf-8") as out:
+        since_sync = 0
+        while chunk := list(islice(pending, chunk_size)):
+            batch = []
+            for submission in chunk:
+                problem = loader.get_problem_by_id(submission["problem_id"])
+                if problem is None:
+                    counts["unknown_problem"] += 1
+                    _write(out, {
+                        "id": submission["id"],
+                        "problem_id": submission["problem_id"],
+                        "is_correct": False,
+                        "message": f"Problem {submission['problem_id']} not found",
+                    })
+                    continue
+                batch.append((submission, problem))
+
+            pairs = [(submission["code"], problem) for submission, problem in batch]
+            # Closed on the way out of an interrupt, so queued checks are dropped
+            # before the worker pool is shut down
+            with closing(iter_check_solutions(pairs, timeout)) as results:
+                for index, result in results:
+                    submission = batch[index][0]
+                    _write(out, {
+                        "id": submission["id"],
+                        "problem_id": submission["problem_id"],
+                        "is_correct": result.is_correct,
+                        "message": result.message,
+                        "details": result.details,
+                    })
+                    counts["graded"] += 1
+                    counts["correct"] += result.is_correct
+                    since_sync += 1
+                    if since_sync >= fsync_every:
+                        out.flush()
+                        os.fsync(out.fileno())
+                        since_sync = 0
+        out.flush()
+        os.fsync(out.fileno())
+
+    counts["skipped"] = len(done)
+    return counts
+
+
+def _write(out, verdict: dict) -> None:
+    out.write(json.dumps(verdict) + "\n")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        prog="python -m engine.grade",
+        description="Grade stored submissions in parallel, resuming from OUTPUT if it exists.",
+    )
+    parser.add_argument("submissions", type=Path, help="JSONL file or <problem_id>/<name>.py directory")
+    parser.add_argument("output", type=Path, help="JSONL file receiving one verdict per line")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=5.0, help="seconds per submission (default: 5.0)")
+    parser.add_argument("--restart", action="store_true", help="discard existing verdicts and start over")
+    args = parser.parse_args(argv)
+
+    if args.restart and args.output.exists():
+        args.output.unlink()
+
+    start_worker_pool(args.workers)
+    try:
+        counts = grade(args.submissions, args.output, timeout=args.timeout)
+    except KeyboardInterrupt:
+        print("Interrupted; re-run the same command to resume.", file=sys.stderr)
+        return 130
+    finally:
+        shutdown_worker_pool()
+
+    print(
+        f"Graded {counts['graded']} submission(s), {counts['correct']} correct; "
+        f"skipped {counts['skipped']} already graded, {counts['unknown_problem']} with unknown problems.",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""Multi-case function test harness, run inside the worker after the user's code.
+
+The submission is executed once; its functions are then called against
+every case in the same namespace, so a problem with dozens of hidden
+cases is graded in a single trip to a worker.
+
+A call group looks like:
+    {"function": "add", "cases": [{"args": [1, 2], "kwargs": {}, "expected": 3}]}
+"""
+
+import math
+from typing import Any
+
+
+def _comparable(value: Any) -> Any:
+    """Convert tuples to lists, recursively, so results compare equal to JSON values."""
+    if isinstance(value, (list, tuple)):
+        return [_comparable(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _comparable(item) for key, item in value.items()}
+    return value
+
+
+def values_match(actual: Any, expected: Any) -> bool:
+    """Compare a returned value to an expected one, allowing float rounding."""
+    actual = _comparable(actual)
+    if isinstance(actual, float) and isinstance(expected, (int, float)) and not isinstance(expected, bool):
+        return math.isclose(actual, expected, rel_tol=1e-9, abs_tol=1e-9)
+    if isinstance(actual, list) and isinstance(expected, list):
+        return len(actual) == len(expected) and all(
+            values_match(a, e) for a, e in zip(actual, expected)
+        )
+    if isinstance(actual, dict) and isinstance(expected, dict):
+        return actual.keys() == expected.keys() and all(
+            values_match(actual[key], expected[key]) for key in actual
+        )
+    return actual == expected
+
+
+def _short_repr(value: Any, limit: int = 200) -> str:
+    text = repr(value)
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+def describe_call(function: str, case: dict) -> str:
+    """Render a case as the call the user would write, e.g. add(1, 2)."""
+    parts = [_short_repr(arg) for arg in case.get("args", [])]
+    parts += [f"{key}={_short_repr(value)}" for key, value in case.get("kwargs", {}).items()]
+    return f"{function}({', '.join(parts)})"
+
+
+def run_function_cases(namespace: dict, calls: list[dict], full_report: bool = False) -> list[dict]:
+    """
+    Call the user's functions against every case of every call group.
+
+    Stops at the first failing case unless full_report is set. Callers
+    should route the functions' output away from the program's own output.
+
+    Args:
+        namespace: Globals of the executed submission
+        calls: Call groups, each naming a function and its cases
+        full_report: Whether to keep going after a failing case
+
+    Returns:
+        One {"function", "passed", "cases"} dict per group that was run,
+        where each case result has "call", "passed", "expected", "actual"
+        and "error"
+    """
+    reports = []
+    for group in calls:
+        function_name = group["function"]
+        report = {"function": function_name, "passed": True, "cases": []}
+        reports.append(report)
+
+        function = namespace.get(function_name)
+        if not callable(function):
+            report["passed"] = False
+            report["error"] = f"Function '{function_name}' is not defined."
+            if full_report:
+                continue
+            break
+
+        for case in group.get("cases", []):
+            outcome = {
+                "call": describe_call(function_name, case),
+                "passed": False,
+                "expected": _short_repr(case.get("expected")),
+                "actual": None,
+                "error": None,
+            }
+            try:
+                actual = function(*case.get("args", []), **case.get("kwargs", {}))
+                outcome["actual"] = _short_repr(actual)
+                outcome["passed"] = values_match(actual, case.get("expected"))
+            except (Exception, SystemExit) as e:
+                outcome["error"] = f"{type(e).__name__}: {e}"
+            report["cases"].append(outcome)
+            if not outcome["passed"]:
+                report["passed"] = False
+                if not full_report:
+                    return reports
+    return reports
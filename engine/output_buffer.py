@@ -0,0 +1,121 @@
+"""Size-capped capture buffer for the output of user code."""
+
+import io
+from collections import deque
+from typing import Callable, Optional
+
+
+class OutputLimitExceeded(BaseException):
+    """Raised inside user code once it has written more output than allowed.
+
+    Derives from BaseException so that `except Exception` in the user's code
+    cannot swallow it.
+    """
+
+    pass
+
+
+def _clip_start(text: str, max_bytes: int) -> str:
+    """Return the longest prefix of text that fits in max_bytes of UTF-8."""
+    return text.encode("utf-8", "replace")[:max_bytes].decode("utf-8", "ignore")
+
+
+def _clip_end(text: str, max_bytes: int) -> str:
+    """Return the longest suffix of text that fits in max_bytes of UTF-8."""
+    if max_bytes <= 0:
+        return ""
+    return text.encode("utf-8", "replace")[-max_bytes:].decode("utf-8", "ignore")
+
+
+class BoundedOutput(io.TextIOBase):
+    """Text stream that keeps at most `limit` bytes of what is written to it.
+
+    The first half of the budget holds the head of the output and the second
+    half holds its most recent tail; anything in between is dropped and
+    reported as truncated. If `abort_after` is set, the write that takes the
+    total past it raises OutputLimitExceeded to stop the program.
+
+    `on_write`, if set, is called with every piece of text written, in full,
+    after it has been stored. If it raises, the text is already captured.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        abort_after: Optional[int] = None,
+        on_write: Optional[Callable[[str], None]] = None,
+    ):
+        self.limit = limit
+        self.abort_after = abort_after
+        self.on_write = on_write
+        self.total_bytes = 0
+        self._head: list[str] = []
+        self._head_size = 0
+        self._head_budget = limit // 2
+        self._head_full = False
+        self._tail: deque[str] = deque()
+        self._tail_size = 0
+        self._tail_budget = limit - self._head_budget
+
+    @property
+    def truncated(self) -> bool:
+        """Whether part of the output had to be dropped."""
+        return self.total_bytes > self.limit
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        if not isinstance(s, str):
+            raise TypeError(f"write() argument must be str, not {type(s).__name__}")
+        written = len(s)
+        self._store(s)
+        if self.on_write is not None:
+            self.on_write(s)
+        self._check_abort()
+        return written
+
+    def _store(self, s: str) -> None:
+        size = len(s.encode("utf-8", "replace"))
+        self.total_bytes += size
+
+        if not self._head_full:
+            head_room = self._head_budget - self._head_size
+            if size <= head_room:
+                self._head.append(s)
+                self._head_size += size
+                return
+            head = _clip_start(s, head_room)
+            self._head.append(head)
+            self._head_size += len(head.encode("utf-8", "replace"))
+            self._head_full = True
+            s = s[len(head):]
+            size = len(s.encode("utf-8", "replace"))
+
+        self._tail.append(s)
+        self._tail_size += size
+        while self._tail_size > self._tail_budget:
+            oldest = self._tail.popleft()
+            oldest_size = len(oldest.encode("utf-8", "replace"))
+            excess = self._tail_size - self._tail_budget
+            if oldest_size > excess:
+                kept = _clip_end(oldest, oldest_size - excess)
+                self._tail.appendleft(kept)
+                self._tail_size += len(kept.encode("utf-8", "replace")) - oldest_size
+                break
+            self._tail_size -= oldest_size
+
+    def _check_abort(self) -> None:
+        if self.abort_after is not None and self.total_bytes > self.abort_after:
+            raise OutputLimitExceeded(
+                f"Output limit exceeded: the program wrote more than {self.abort_after} bytes and was stopped."
+            )
+
+    def getvalue(self) -> str:
+        """Return the captured output, with a marker where bytes were dropped."""
+        head = "".join(self._head)
+        tail = "".join(self._tail)
+        if not self.truncated:
+            return head + tail
+        dropped = self.total_bytes - self._head_size - self._tail_size
+        return f"{head}\n... [{dropped} bytes of output truncated] ...\n{tail}"
@@ -0,0 +1,75 @@
+"""Incremental checking of a program's output against its expected output.
+
+The matcher is fed stdout as it is written and counts its lines the way
+normalize_output would: leading blank output is skipped, and lines of
+only whitespace are blank. Once non-blank output goes past the
+last expected line it raises OutputMismatch to stop the program instead
+of letting a wrong solution run out its timeout. A line that differs
+within the expected ones does not stop it: the usual diff hint reports
+the line count of the whole output, so the run goes on until that is
+known to be wrong or the program ends.
+"""
+
+
+def normalize_output(output: str) -> str:
+    """Normalize output for comparison (strip trailing whitespace per line, normalize newlines)."""
+    lines = output.strip().split("\n")
+    return "\n".join(line.rstrip() for line in lines)
+
+
+class OutputMismatch(BaseException):
+    """Raised inside user code once its output can no longer match.
+
+    A BaseException so that `except Exception` in user code cannot swallow it.
+    """
+
+
+class OutputMatcher:
+    """Stops output that runs past a normalized expected output as it is written."""
+
+    def __init__(self, expected_output: str):
+        """Initialize the matcher.
+
+        Args:
+            expected_output: The expected output, already normalized
+        """
+        self.expected_line_count = expected_output.count("\n") + 1
+        self.stopped = False
+        self._line_index = 0
+        self._started = False
+        # Whether the current unfinished line has anything but whitespace
+        self._pending_content = False
+
+    def feed(self, text: str) -> None:
+        """Check newly written text, raising OutputMismatch once it runs past the expected lines."""
+        if self.stopped:
+            raise OutputMismatch()
+        if not self._started:
+            # normalize_output strips leading whitespace from the whole output
+            text = text.lstrip()
+            if not text:
+                return
+            self._started = True
+
+        *complete, rest = text.split("\n")
+        if complete:
+            self._check_line(self._pending_content or bool(complete[0].strip()))
+            for line in complete[1:]:
+                self._check_line(bool(line.strip()))
+            self._pending_content = False
+        if rest.strip():
+            self._pending_content = True
+            # An unfinished line past the end is already extra
+            if self._line_index >= self.expected_line_count:
+                self._stop()
+
+    def _check_line(self, has_content: bool) -> None:
+        index = self._line_index
+        self._line_index += 1
+        if index >= self.expected_line_count and has_content:
+            # Blank lines past the end are stripped by normalization; anything else is extra
+            self._stop()
+
+    def _stop(self) -> None:
+        self.stopped = True
+        raise OutputMismatch()
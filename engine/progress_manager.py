@@ -1,6 +1,22 @@
-"""Progress manager for persisting user progress locally."""
+"""Progress manager for persisting user progress locally.
 
+The progress file is always replaced atomically: it is written to a
+temporary file next to it, flushed to disk and renamed over the old one,
+so a crash mid-write leaves the previous progress intact.
+
+In write-behind mode, changes only mark the progress dirty and a
+background thread writes it once no change has arrived for the flush
+interval, or straight away once enough changes have piled up. A burst of
+hint reveals then costs one write instead of one per click. Pending
+changes are written by close(), which also runs at interpreter exit.
+"""
+
+import atexit
 import json
+import os
+import stat
+import tempfile
+import threading
 from pathlib import Path
 from typing import Optional
 
@@ -8,11 +24,20 @@ from typing import Optional
 class ProgressManager:
     """Manages saving and loading user progress to/from a local JSON file."""
 
-    def __init__(self, save_file: Optional[str] = None):
+    def __init__(
+        self,
+        save_file: Optional[str] = None,
+        write_behind: bool = False,
+        flush_interval: float = 1.0,
+        max_dirty: int = 50,
+    ):
         """Initialize the progress manager.
         
         Args:
             save_file: Path to the save file. Defaults to 'progress.json' in user's home.
+            write_behind: Save changes from a background thread instead of on every change.
+            flush_interval: In write-behind mode, seconds without changes before saving.
+            max_dirty: In write-behind mode, number of unsaved changes that forces a save.
         """
         if save_file:
             self.save_path = Path(save_file)
@@ -21,6 +46,17 @@ class ProgressManager:
             self.save_path = Path(__file__).parent.parent / "progress.json"
         
         self._data = self._load()
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.max_dirty = max_dirty
+        # Guards _data and _dirty; _write_lock keeps saves in order
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._dirty = 0
+        self._changed_event = threading.Event()
+        self._urgent = threading.Event()
+        self._closed = False
+        self._writer: Optional[threading.Thread] = None
 
     def _load(self) -> dict:
         """Load progress from file."""
@@ -46,22 +82,119 @@ class ProgressManager:
         }
 
     def save(self) -> bool:
-        """Save progress to file.
+        """Save progress to file now, replacing it atomically.
         
         Returns:
             True if save was successful, False otherwise.
         """
+        with self._write_lock:
+            with self._lock:
+                # Convert set to list for JSON serialization
+                save_data = {
+                    "completed_problems": sorted(self._data.get("completed_problems", set())),
+                    "hint_usage": dict(self._data.get("hint_usage", {})),
+                }
+                dirty, self._dirty = self._dirty, 0
+            try:
+                self._write(json.dumps(save_data, separators=(",", ":")))
+                return True
+            except IOError:
+                with self._lock:
+                    self._dirty += dirty
+                return False
+
+    def _file_mode(self) -> int:
+        """Return the permission bits of the save file, or 0o644 if there is none yet."""
+        try:
+            return stat.S_IMODE(os.stat(self.save_path).st_mode)
+        except FileNotFoundError:
+            return 0o644
+
+    def _write(self, text: str) -> None:
+        """Write text to a temporary file, sync it and rename it over the save file."""
+        fd, temp_path = tempfile.mkstemp(
+            dir=self.save_path.parent, prefix=f".{self.save_path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            # mkstemp creates the file private to its owner; keep the save file's own mode
+            os.chmod(temp_path, self._file_mode())
+            os.replace(temp_path, self.save_path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+        # Make the rename itself durable, where directories can be synced
         try:
-            # Convert set to list for JSON serialization
-            save_data = {
-                "completed_problems": list(self._data.get("completed_problems", set())),
-                "hint_usage": self._data.get("hint_usage", {}),
-            }
-            with open(self.save_path, "w", encoding="utf-8") as f:
-                json.dump(save_data, f, indent=2)
-            return True
-        except IOError:
-            return False
+            dir_fd = os.open(self.save_path.parent, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+
+    def flush(self) -> bool:
+        """Save progress if anything changed since the last save.
+        
+        Returns:
+            True if nothing was pending or the save was successful, False otherwise.
+        """
+        with self._lock:
+            if not self._dirty:
+                return True
+        return self.save()
+
+    def close(self) -> None:
+        """Stop the background writer and save any pending changes."""
+        with self._lock:
+            self._closed = True
+            writer, self._writer = self._writer, None
+        self._changed_event.set()
+        self._urgent.set()
+        if writer is not None and writer is not threading.current_thread():
+            writer.join()
+        self.flush()
+
+    def _changed(self) -> None:
+        """Record a change: save it now, or leave it to the background writer."""
+        with self._lock:
+            self._dirty += 1
+            if not self.write_behind or self._closed:
+                urgent = None
+            else:
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._run_writer, name="progress-writer", daemon=True)
+                    self._writer.start()
+                    atexit.register(self.close)
+                urgent = self._dirty >= self.max_dirty
+        if urgent is None:
+            self.save()
+            return
+        self._changed_event.set()
+        if urgent:
+            self._urgent.set()
+
+    def _run_writer(self) -> None:
+        while True:
+            self._changed_event.wait()
+            # Wait for the changes to settle, unless enough have piled up
+            while not self._closed and not self._urgent.is_set():
+                self._changed_event.clear()
+                if not self._changed_event.wait(self.flush_interval):
+                    break
+            if self._closed:
+                return
+            self._changed_event.clear()
+            self._urgent.clear()
+            self.flush()
 
     def get_completed_problems(self) -> set[str]:
         """Get the set of completed problem IDs."""
@@ -73,8 +206,9 @@ class ProgressManager:
         Args:
             problem_id: The ID of the completed problem.
         """
-        self._data["completed_problems"].add(problem_id)
-        self.save()
+        with self._lock:
+            self._data["completed_problems"].add(problem_id)
+        self._changed()
 
     def is_completed(self, problem_id: str) -> bool:
         """Check if a problem is completed.
@@ -105,15 +239,17 @@ class ProgressManager:
             problem_id: The ID of the problem.
             count: Number of hints revealed.
         """
-        if "hint_usage" not in self._data:
-            self._data["hint_usage"] = {}
-        self._data["hint_usage"][problem_id] = count
-        self.save()
+        with self._lock:
+            if "hint_usage" not in self._data:
+                self._data["hint_usage"] = {}
+            self._data["hint_usage"][problem_id] = count
+        self._changed()
 
     def reset_progress(self) -> None:
         """Reset all progress."""
-        self._data = self._default_data()
-        self.save()
+        with self._lock:
+            self._data = self._default_data()
+        self._changed()
 
     def get_stats(self) -> dict:
         """Get progress statistics.
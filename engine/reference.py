@@ -0,0 +1,109 @@
+"""Validation of reference solutions against their own problems.
+
+Every problem's `solution` is run through the worker pool and checked
+against the problem itself, so a solution that disagrees with its
+`expected_output` or test cases is reported instead of silently failing
+every learner. Runtimes and outcomes are stored in the reference registry.
+
+Usage:
+    python -m engine.reference [--runs N] [--workers N] [--timeout S]
+
+Exits with status 1 if any reference solution fails its own problem.
+"""
+
+import argparse
+import logging
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from problems import ProblemLoader
+
+from .code_executor import execute_code
+from .reference_registry import ReferenceResult, get_reference_registry
+from .solution_checker import check_solution
+from .worker_pool import get_worker_pool, shutdown_worker_pool, start_worker_pool
+
+logger = logging.getLogger(__name__)
+
+
+def validate_references(
+    problems: list[dict],
+    runs: int = 1,
+    timeout: float = 10.0,
+    stop: Optional[threading.Event] = None,
+) -> list[ReferenceResult]:
+    """
+    Run every reference solution in parallel and check it against its problem.
+
+    Args:
+        problems: Problems to validate; those without a solution are skipped
+        runs: Times to run each solution, for more runtime samples
+        timeout: Execution timeout in seconds for each run
+        stop: Event that abandons the remaining work once set, e.g. on shutdown
+
+    Returns:
+        The results of the reference solutions that failed
+    """
+    registry = get_reference_registry()
+    registry.register(problems)
+    problems = [p for p in problems if p.get("solution")]
+
+    def stopped() -> bool:
+        return stop is not None and stop.is_set()
+
+    def run(problem: dict) -> Optional[ReferenceResult]:
+        runtimes = []
+        failure = None
+        for _ in range(runs):
+            if stopped():
+                return None
+            result = execute_code(problem["solution"], timeout)
+            if not result.success:
+                failure = result.error
+                break
+            runtimes.append(result.execution_time)
+        if failure is None:
+            verdict = check_solution(problem["solution"], problem, timeout, full_report=True)
+            if not verdict.is_correct:
+                failure = "\n".join(filter(None, [verdict.message, verdict.details]))
+        # Runs cut short by a shutdown say nothing about the solution
+        if stopped():
+            return None
+        return registry.record(problem["id"], runtimes, failure)
+
+    workers = get_worker_pool().size or 1
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reference") as executor:
+        failures = [result for result in executor.map(run, problems) if result and not result.passed]
+    for result in failures:
+        logger.warning("Reference solution of %s fails its own problem: %s", result.problem_id, result.details)
+    return failures
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        prog="python -m engine.reference",
+        description="Check that every reference solution passes its own problem.",
+    )
+    parser.add_argument("--runs", type=int, default=1, help="runs per solution (default: 1)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="seconds per run (default: 10.0)")
+    args = parser.parse_args(argv)
+
+    problems = ProblemLoader().get_all_problems()
+    start_worker_pool(args.workers)
+    try:
+        failures = validate_references(problems, args.runs, args.timeout)
+    finally:
+        shutdown_worker_pool()
+
+    for result in failures:
+        print(f"{result.problem_id}: {result.details}", file=sys.stderr)
+    print(f"Validated {len(problems)} problem(s), {len(failures)} failing.", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
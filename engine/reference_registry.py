@@ -0,0 +1,97 @@
+"""Per-problem facts learned from reference solutions.
+
+The registry keeps, for each problem, its normalized expected output, so
+the check hot path does not normalize it again on every submission, and
+the runtimes measured when its reference solution was validated (see
+engine.reference).
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from .output_matcher import normalize_output
+
+
+@dataclass
+class ReferenceResult:
+    """What is known about one problem's reference solution.
+
+    `expected_output` is the text `normalized_expected` was computed from,
+    so a problem edited since registration is not matched against stale
+    output. `passed` is None until the solution has been run.
+    """
+
+    problem_id: str
+    expected_output: Optional[str]
+    normalized_expected: Optional[str]
+    runtimes: list[float] = field(default_factory=list)
+    passed: Optional[bool] = None
+    details: Optional[str] = None
+
+
+class ReferenceRegistry:
+    """Per-problem normalized expected outputs and reference runtimes."""
+
+    def __init__(self):
+        self._results: dict[str, ReferenceResult] = {}
+        self._lock = threading.Lock()
+
+    def register(self, problems: Iterable[dict]) -> None:
+        """Normalize the expected output of each problem, without running anything."""
+        with self._lock:
+            for problem in problems:
+                expected = problem.get("expected_output")
+                current = self._results.get(problem["id"])
+                if current is not None and current.expected_output == expected:
+                    continue
+                self._results[problem["id"]] = ReferenceResult(
+                    problem_id=problem["id"],
+                    expected_output=expected,
+                    normalized_expected=normalize_output(expected) if expected else None,
+                )
+
+    def forget(self, problem_ids: Iterable[str]) -> None:
+        """Drop what is known about problems that were changed or removed."""
+        with self._lock:
+            for problem_id in problem_ids:
+                self._results.pop(problem_id, None)
+
+    def normalized_expected(self, problem: dict) -> str:
+        """Return the normalized expected output of a problem, computing it if not registered."""
+        expected = problem.get("expected_output") or ""
+        result = self._results.get(problem.get("id"))
+        if result is not None and result.expected_output == expected:
+            return result.normalized_expected
+        return normalize_output(expected)
+
+    def get(self, problem_id: str) -> Optional[ReferenceResult]:
+        """Return what is known about a problem's reference solution."""
+        return self._results.get(problem_id)
+
+    def record(self, problem_id: str, runtimes: list[float], failure: Optional[str]) -> ReferenceResult:
+        """Store the outcome of running a registered problem's reference solution."""
+        with self._lock:
+            result = self._results[problem_id]
+            result.runtimes = runtimes
+            result.passed = failure is None
+            result.details = failure
+            return result
+
+    def stats(self) -> dict:
+        """Return how many problems have been registered and validated."""
+        with self._lock:
+            results = list(self._results.values())
+        return {
+            "problems": len(results),
+            "validated": sum(r.passed is not None for r in results),
+            "failed": sorted(r.problem_id for r in results if r.passed is False),
+        }
+
+
+_registry = ReferenceRegistry()
+
+
+def get_reference_registry() -> ReferenceRegistry:
+    """Get the shared reference registry."""
+    return _registry
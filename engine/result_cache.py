@@ -0,0 +1,168 @@
+"""Cache of check verdicts for repeated submissions to the same problem.
+
+Submissions are keyed on their AST rather than their text, so code that
+only differs in whitespace or comments shares one verdict. Verdicts that
+quote the code's line numbers, such as tracebacks, are keyed on the exact
+text instead, since a comment added above the error moves it. Keys also
+include a fingerprint of the problem's expected output and test cases, so
+editing a problem makes its old verdicts unreachable. Fingerprints are
+kept per problem and only recomputed once those fields change.
+"""
+
+import ast
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Optional
+
+from .structure import MAX_CACHED_LENGTH, parse_submission
+
+
+def normalize_submission(code: str) -> str:
+    """Return a form of the code that ignores whitespace and comments.
+
+    Code that does not parse is normalized to its stripped text. The parse
+    tree is shared with the structural checks (see engine.structure).
+    """
+    tree = parse_submission(code)
+    if tree is None:
+        return code.strip()
+    try:
+        return ast.dump(tree)
+    except RecursionError:
+        return code.strip()
+
+
+def submission_digest(code: str, normalize: bool = True) -> str:
+    """Hash a submission, normalized unless asked to use the exact text.
+
+    Memoized up to the same length as parse trees (see engine.structure),
+    so byte-identical resubmissions skip parsing without the memo keeping
+    large submissions alive.
+    """
+    if len(code) > MAX_CACHED_LENGTH:
+        return _digest(code, normalize)
+    return _digest_cached(code, normalize)
+
+
+def _digest(code: str, normalize: bool) -> str:
+    submission = normalize_submission(code) if normalize else code
+    return hashlib.sha256(submission.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+_digest_cached = lru_cache(maxsize=4096)(_digest)
+
+
+def problem_fingerprint(problem: dict) -> str:
+    """Hash the parts of a problem that decide whether a submission is correct."""
+    checked = {
+        "expected_output": problem.get("expected_output"),
+        "test_cases": problem.get("test_cases"),
+    }
+    return hashlib.sha256(json.dumps(checked, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class VerdictCache:
+    """LRU cache of check results with a time-to-live."""
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 3600.0):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of verdicts to keep.
+            ttl: Seconds a verdict stays valid.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # key -> (verdict, time stored)
+        self._entries: OrderedDict[tuple, tuple[Any, float]] = OrderedDict()
+        # problem id -> (expected output, test cases, fingerprint of the two)
+        self._fingerprints: dict[str, tuple[Any, Any, str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key_for(self, user_code: str, problem: dict, exact: bool = False) -> Optional[tuple]:
+        """Build the cache key for a submission, or None if it cannot be cached.
+
+        Exact keys hash the code's text rather than its AST; use them for
+        verdicts that mention line numbers.
+        """
+        problem_id = problem.get("id")
+        if problem_id is None:
+            return None
+        digest = submission_digest(user_code, normalize=not exact)
+        return (problem_id, digest, self._fingerprint(problem_id, problem))
+
+    def _fingerprint(self, problem_id: str, problem: dict) -> str:
+        """Return the problem's fingerprint, reusing the last one while its checked fields are unchanged."""
+        expected_output = problem.get("expected_output")
+        test_cases = problem.get("test_cases")
+        known = self._fingerprints.get(problem_id)
+        if known is not None and known[0] == expected_output and known[1] == test_cases:
+            return known[2]
+        fingerprint = problem_fingerprint(problem)
+        with self._lock:
+            self._fingerprints[problem_id] = (expected_output, copy.deepcopy(test_cases), fingerprint)
+        return fingerprint
+
+    def get(self, *keys: tuple) -> Optional[Any]:
+        """Return a copy of the verdict cached under the first of keys that is present and fresh."""
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                if now - entry[1] > self.ttl:
+                    del self._entries[key]
+                    continue
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.copy(entry[0])
+            self.misses += 1
+            return None
+
+    def put(self, key: tuple, verdict: Any) -> None:
+        """Store a verdict, evicting the least recently used ones if full."""
+        with self._lock:
+            self._entries[key] = (copy.copy(verdict), time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, problem_id: str) -> None:
+        """Drop all verdicts for a problem."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == problem_id]:
+                del self._entries[key]
+            self._fingerprints.pop(problem_id, None)
+
+    def clear(self) -> None:
+        """Drop all verdicts."""
+        with self._lock:
+            self._entries.clear()
+            self._fingerprints.clear()
+
+    def stats(self) -> dict:
+        """Return hit-rate and size counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+_cache = VerdictCache()
+
+
+def get_verdict_cache() -> VerdictCache:
+    """Get the shared verdict cache."""
+    return _cache
@@ -0,0 +1,353 @@
+"""In-process execution of user code, used by the execution workers."""
+
+import io
+import marshal
+import math
+import os
+import sys
+import threading
+import time
+import traceback
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional, TextIO, Union
+
+from .harness import run_function_cases
+from .output_buffer import BoundedOutput, OutputLimitExceeded
+from .output_matcher import OutputMatcher, OutputMismatch
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+# A run is stopped once its output reaches this multiple of max_output_bytes
+OUTPUT_ABORT_FACTOR = 4
+
+
+@dataclass
+class ExecutionLimits:
+    """Per-run resource limits.
+
+    CPU and memory limits are only enforced inside worker processes. The
+    output limit caps the bytes kept from stdout and stderr; a run that
+    writes OUTPUT_ABORT_FACTOR times more than that is stopped.
+    """
+
+    cpu_seconds: Optional[float] = None
+    memory_bytes: Optional[int] = None
+    max_output_bytes: int = 64 * 1024
+
+
+def output_buffer(limits: Optional[ExecutionLimits]) -> BoundedOutput:
+    """Create a capture buffer sized by the given limits."""
+    limit = (limits or ExecutionLimits()).max_output_bytes
+    return BoundedOutput(limit, abort_after=limit * OUTPUT_ABORT_FACTOR)
+
+
+# Output buffers of the execution running in the current context, as (stdout, stderr)
+_active_capture: ContextVar[Optional[tuple[TextIO, TextIO]]] = ContextVar(
+    "active_capture", default=None
+)
+# Output buffers of the execution that started each thread, for threads
+# started by user code, which do not inherit its context
+_thread_captures: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_routers: Optional[tuple["_RoutingStream", "_RoutingStream"]] = None
+_install_lock = threading.Lock()
+
+
+def _current_capture() -> Optional[tuple[TextIO, TextIO]]:
+    """Return the output buffers the calling thread writes to, if any."""
+    capture = _active_capture.get()
+    if capture is None:
+        capture = _thread_captures.get(threading.current_thread())
+    return capture
+
+
+_thread_start = threading.Thread.start
+
+
+def _start_with_capture(thread: threading.Thread) -> None:
+    """Thread.start that ties the new thread to the execution starting it."""
+    capture = _current_capture()
+    if capture is not None:
+        _thread_captures[thread] = capture
+    _thread_start(thread)
+
+
+class _RoutingStream(io.TextIOBase):
+    """Stand-in for sys.stdout or sys.stderr that writes to the active execution's buffer.
+
+    Writes from threads that user code started go to the execution that
+    started them, even once it is over, so they never reach another run.
+    Writes made outside of any execution go to the original stream, so the
+    streams can stay installed for the lifetime of the process.
+    """
+
+    def __init__(self, index: int, fallback: TextIO):
+        self._index = index
+        self._fallback = fallback
+
+    def _target(self) -> TextIO:
+        capture = _current_capture()
+        if capture is None:
+            return self._fallback
+        return capture[self._index]
+
+    def write(self, s: str) -> int:
+        return self._target().write(s)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+    def writable(self) -> bool:
+        return True
+
+    def __getattr__(self, name):
+        return getattr(self._fallback, name)
+
+
+def _install_routing_streams() -> None:
+    """Make sure sys.stdout and sys.stderr are this process's routing streams."""
+    global _routers
+    with _install_lock:
+        if _routers is None:
+            _routers = (_RoutingStream(0, sys.stdout), _RoutingStream(1, sys.stderr))
+            threading.Thread.start = _start_with_capture
+        sys.stdout, sys.stderr = _routers
+
+
+@contextmanager
+def capture_output(output_capture: TextIO, error_capture: TextIO):
+    """Route stdout and stderr of the current context into the given buffers.
+
+    The buffers are bound to a context variable rather than swapped into
+    sys.stdout and sys.stderr, so executions running concurrently in other
+    threads of the same process keep their output separate. Threads the
+    code starts write to the same buffers.
+    """
+    _install_routing_streams()
+    token = _active_capture.set((output_capture, error_capture))
+    try:
+        yield
+    finally:
+        _active_capture.reset(token)
+        # User code may have replaced the streams; put the routers back
+        _install_routing_streams()
+
+
+def format_exception() -> str:
+    """Format the exception being handled, keeping only the user's frames."""
+    tb_lines = traceback.format_exc().split("\n")
+    # Filter to show relevant lines
+    relevant_lines = []
+    for line in tb_lines:
+        if '<string>' in line or not line.startswith('  File'):
+            relevant_lines.append(line)
+    return "\n".join(relevant_lines).strip()
+
+
+def timeout_message(timeout: float) -> str:
+    """Return the error reported when code exceeds its time limit."""
+    return f"Timeout: Code execution exceeded {timeout} seconds. Possible infinite loop?"
+
+
+def _address_space_in_use() -> int:
+    """Return the current virtual memory size of this process in bytes."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+@contextmanager
+def resource_limits(limits: Optional[ExecutionLimits]):
+    """Apply CPU and address-space limits to the current process for one run.
+
+    Only the soft limits are changed so they can be restored afterwards. The
+    CPU limit is relative to the CPU time already used by the process, and
+    the memory limit is relative to its current address space. Exceeding
+    the CPU limit terminates the process with SIGXCPU; exceeding the memory
+    limit raises MemoryError in the user's code.
+    """
+    if resource is None or limits is None:
+        yield
+        return
+
+    saved = {}
+    if limits.cpu_seconds is not None:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        used = usage.ru_utime + usage.ru_stime
+        saved[resource.RLIMIT_CPU] = resource.getrlimit(resource.RLIMIT_CPU)
+        _set_soft_limit(resource.RLIMIT_CPU, math.ceil(used + limits.cpu_seconds))
+    if limits.memory_bytes is not None:
+        saved[resource.RLIMIT_AS] = resource.getrlimit(resource.RLIMIT_AS)
+        _set_soft_limit(resource.RLIMIT_AS, _address_space_in_use() + limits.memory_bytes)
+    try:
+        yield
+    finally:
+        for kind, limit in saved.items():
+            resource.setrlimit(kind, limit)
+
+
+def _set_soft_limit(kind: int, value: int) -> None:
+    """Lower the soft limit of a resource without touching the hard limit."""
+    _, hard = resource.getrlimit(kind)
+    if hard != resource.RLIM_INFINITY:
+        value = min(value, hard)
+    resource.setrlimit(kind, (value, hard))
+
+
+def execute(
+    code: Union[str, bytes],
+    output_capture: BoundedOutput,
+    error_capture: BoundedOutput,
+    calls: Optional[list[dict]] = None,
+    full_report: bool = False,
+    expected_output: Optional[str] = None,
+) -> dict:
+    """
+    Execute Python code in the calling thread, capturing its output.
+
+    Output is captured per execution, so several threads may call this
+    concurrently without their output mixing. If calls are given and the
+    code runs successfully, its functions are then called against those
+    cases in the same namespace (see engine.harness). If expected_output
+    is given, the run is stopped as soon as its output runs past it
+    (see engine.output_matcher) and the result is marked output_mismatch.
+
+    Args:
+        code: The Python code to execute, or its marshalled bytecode
+        output_capture: Buffer receiving everything written to stdout
+        error_capture: Buffer receiving everything written to stderr
+        calls: Optional function call groups to run after the code
+        full_report: Whether to run every case instead of stopping at the first failure
+        expected_output: Normalized output the program must produce
+
+    Returns:
+        Dictionary with the ExecutionResult fields
+    """
+    result = {"output": "", "error": None, "success": False, "execution_time": 0.0, "truncated": False}
+    if expected_output is not None:
+        _watch_output(output_capture, OutputMatcher(expected_output))
+    start_time = time.time()
+
+    try:
+        # Create a restricted global namespace
+        exec_globals = {
+            "__builtins__": __builtins__,
+            "__name__": "__main__",
+        }
+
+        if isinstance(code, bytes):
+            code = marshal.loads(code)
+
+        # Execute the code
+        with capture_output(output_capture, error_capture):
+            exec(code, exec_globals)
+
+        result["output"] = output_capture.getvalue()
+        result["success"] = True
+
+        if calls:
+            # Output printed by the called functions is not part of the program's output
+            discard = BoundedOutput(0)
+            with capture_output(discard, discard):
+                result["case_results"] = run_function_cases(exec_globals, calls, full_report)
+
+    except OutputLimitExceeded as e:
+        result["output"] = output_capture.getvalue()
+        result["error"] = str(e)
+
+    except OutputMismatch:
+        result["output"] = output_capture.getvalue()
+        result["output_mismatch"] = True
+
+    except SystemExit as e:
+        # exit() ends the program; it must not take the worker down with it
+        result["output"] = output_capture.getvalue()
+        if e.code is None or e.code == 0:
+            result["success"] = True
+        else:
+            result["error"] = f"SystemExit: {e.code}"
+
+    except Exception:
+        result["output"] = output_capture.getvalue()
+        result["error"] = format_exception()
+
+    finally:
+        result["execution_time"] = time.time() - start_time
+        result["truncated"] = output_capture.truncated
+
+    return result
+
+
+def _watch_output(output_capture: BoundedOutput, matcher: OutputMatcher) -> None:
+    """Feed everything written to output_capture through matcher as well."""
+    forward = output_capture.on_write
+    if forward is None:
+        output_capture.on_write = matcher.feed
+        return
+
+    def on_write(text: str) -> None:
+        forward(text)
+        matcher.feed(text)
+
+    output_capture.on_write = on_write
+
+
+def run_code(
+    code: Union[str, bytes],
+    timeout: float,
+    limits: Optional[ExecutionLimits] = None,
+    calls: Optional[list[dict]] = None,
+    full_report: bool = False,
+    expected_output: Optional[str] = None,
+) -> dict:
+    """
+    Execute Python code in a daemon thread of the current process.
+
+    Used when no worker processes are available. The thread cannot be
+    stopped, so on timeout it is abandoned rather than killed.
+
+    Args:
+        code: The Python code to execute, or its marshalled bytecode
+        timeout: Maximum execution time in seconds
+        limits: Limits for this run; only the output limit applies in-process
+        calls: Optional function call groups to run after the code
+        full_report: Whether to run every case instead of stopping at the first failure
+        expected_output: Normalized output the program must produce, checked as it runs
+
+    Returns:
+        Dictionary with the ExecutionResult fields
+    """
+    output_capture = output_buffer(limits)
+    error_capture = output_buffer(limits)
+    result = {"output": "", "error": None, "success": False, "execution_time": 0.0, "truncated": False}
+
+    def target():
+        """Inner function to run code in a thread."""
+        result.update(execute(code, output_capture, error_capture, calls, full_report, expected_output))
+
+    # Run code in a thread with timeout
+    thread = threading.Thread(target=target)
+    thread.daemon = True
+    thread.start()
+    thread.join(timeout)
+
+    if thread.is_alive():
+        # Code is still running - timeout occurred
+        return {
+            "output": output_capture.getvalue(),
+            "error": timeout_message(timeout),
+            "execution_time": timeout,
+            "success": False,
+            "truncated": output_capture.truncated,
+            "interrupted": True,
+        }
+
+    return result
@@ -2,7 +2,12 @@
 
 from dataclasses import dataclass
 from typing import Optional
-from .code_executor import execute_code, ExecutionResult
+from .code_executor import execute_code, execute_with_cases, ExecutionResult
+from .output_matcher import normalize_output
+from .reference_registry import get_reference_registry
+from .result_cache import get_verdict_cache
+from .structure import STRUCTURAL_CHECKS, check_structure, parse_submission
+from .time_budget import get_time_budget
 
 
 @dataclass
@@ -16,30 +21,125 @@ class CheckResult:
     details: Optional[str] = None
 
 
-def normalize_output(output: str) -> str:
-    """Normalize output for comparison (strip trailing whitespace per line, normalize newlines)."""
-    lines = output.strip().split("\n")
-    return "\n".join(line.rstrip() for line in lines)
-
-
 def check_solution(
     user_code: str,
     problem: dict,
     timeout: float = 5.0,
+    full_report: bool = False,
 ) -> CheckResult:
     """
     Check if user's solution is correct.
 
+    Function test cases are run in the same worker trip as the code itself.
+    For problems with an expected output, the run is stopped as soon as
+    its output runs past it. The timeout is capped at the problem's
+    time budget (see engine.time_budget).
+
     Args:
         user_code: The user's submitted code
         problem: The problem dictionary containing expected output/test cases
-        timeout: Execution timeout in seconds
+        timeout: Requested execution timeout in seconds
+        full_report: Whether to run every function case instead of stopping at the first failure
 
     Returns:
         CheckResult with correctness status and feedback
     """
-    # Execute user's code
-    result = execute_code(user_code, timeout)
+    timeout = get_time_budget().clamp(timeout, problem.get("id"))
+
+    # Repeated submissions of the same code are answered from the verdict cache
+    cache = get_verdict_cache()
+    key = exact_key = None
+    if not full_report:
+        key = cache.key_for(user_code, problem)
+        exact_key = cache.key_for(user_code, problem, exact=True)
+    if key is not None:
+        cached = cache.get(key, exact_key)
+        if cached is not None:
+            return cached
+
+    # Structural rules are answered from the parse tree; code that fails one
+    # is still run for its output, but not against anything else
+    failure = _check_structure(user_code, problem.get("test_cases", []))
+    if failure is not None:
+        result = execute_code(user_code, timeout)
+        if result.success:
+            failure.user_output = result.output
+            verdict = failure
+        else:
+            verdict = _evaluate(user_code, problem, result, timeout)
+    else:
+        # Execute user's code
+        calls = [tc for tc in problem.get("test_cases", []) if tc.get("check_type") == "function"]
+        if calls:
+            result = execute_with_cases(user_code, calls, timeout, full_report=full_report)
+        elif problem.get("expected_output"):
+            expected = get_reference_registry().normalized_expected(problem)
+            result = execute_code(user_code, timeout, expected_output=expected)
+        else:
+            result = execute_code(user_code, timeout)
+        verdict = _evaluate(user_code, problem, result, timeout)
+
+    # Timeouts depend on server load, so only cache runs that finished on their own.
+    # Errors quote line numbers, which comments and blank lines shift, so
+    # they are only reused for the exact same text.
+    if key is not None and not result.interrupted:
+        cache.put(exact_key if result.error else key, verdict)
+    return verdict
+
+
+def _check_structure(user_code: str, test_cases: list) -> Optional[CheckResult]:
+    """Check the structural test cases, returning a failing result if one fails.
+
+    Code that does not parse is left to execution to report.
+    """
+    structural = [tc for tc in test_cases if tc.get("check_type") in STRUCTURAL_CHECKS]
+    if not structural:
+        return None
+    tree = parse_submission(user_code)
+    if tree is None:
+        return None
+
+    for test_case in structural:
+        failure = check_structure(tree, test_case)
+        if failure is not None:
+            return CheckResult(
+                is_correct=False,
+                message=failure,
+                user_output="",
+                expected_output=None,
+                details=_STRUCTURE_HINTS[test_case["check_type"]],
+            )
+    return None
+
+
+_STRUCTURE_HINTS = {
+    "variable_exists": "Make sure you've created all the required variables.",
+    "assigns_variable": "Make sure you've created all the required variables.",
+    "defines_function": "Make sure you've defined the required function with the right parameters.",
+    "uses_construct": "Make sure your solution uses the construct this exercise asks for.",
+}
+
+
+def _evaluate(
+    user_code: str,
+    problem: dict,
+    result: ExecutionResult,
+    timeout: float,
+) -> CheckResult:
+    """Judge the result of running the user's code against the problem."""
+    # The run was stopped early because its output ran past the expected
+    # lines; the line count in the hint is where it was stopped
+    if result.output_mismatch:
+        expected_output = problem["expected_output"]
+        return CheckResult(
+            is_correct=False,
+            message="Not quite right. Your output doesn't match the expected output.",
+            user_output=result.output,
+            expected_output=expected_output,
+            details=_generate_diff_hint(
+                normalize_output(result.output), get_reference_registry().normalized_expected(problem)
+            ),
+        )
 
     # If execution failed, return error feedback
     if not result.success:
@@ -55,7 +155,7 @@ def check_solution(
     expected_output = problem.get("expected_output")
     if expected_output:
         normalized_user = normalize_output(result.output)
-        normalized_expected = normalize_output(expected_output)
+        normalized_expected = get_reference_registry().normalized_expected(problem)
 
         if normalized_user == normalized_expected:
             return CheckResult(
@@ -103,34 +203,33 @@ def _check_test_cases(
     timeout: float,
 ) -> CheckResult:
     """Check user code against test cases."""
+    function_reports = iter(initial_result.case_results or [])
     for i, test_case in enumerate(test_cases):
         check_type = test_case.get("check_type", "output")
 
-        if check_type == "variable_exists":
-            # Check if specific variables exist in the code
-            variables = test_case.get("variables", [])
-            missing = []
-            for var in variables:
-                if var not in user_code:
-                    missing.append(var)
-            
-            if missing:
+        if check_type in STRUCTURAL_CHECKS:
+            # Already checked on the parse tree before execution
+            continue
+
+        if check_type == "output":
+            expected = test_case.get("expected", "")
+            if normalize_output(initial_result.output) != normalize_output(expected):
                 return CheckResult(
                     is_correct=False,
-                    message=f"Missing required variable(s): {', '.join(missing)}",
+                    message=f"Test case {i + 1} failed.",
                     user_output=initial_result.output,
-                    expected_output=None,
-                    details="Make sure you've created all the required variables.",
+                    expected_output=expected,
                 )
 
-        elif check_type == "output":
-            expected = test_case.get("expected", "")
-            if normalize_output(initial_result.output) != normalize_output(expected):
+        elif check_type == "function":
+            report = next(function_reports, None)
+            if report is None or not report["passed"]:
                 return CheckResult(
                     is_correct=False,
                     message=f"Test case {i + 1} failed.",
                     user_output=initial_result.output,
-                    expected_output=expected,
+                    expected_output=None,
+                    details=_describe_function_report(report),
                 )
 
     return CheckResult(
@@ -141,6 +240,28 @@ def _check_test_cases(
     )
 
 
+def _describe_function_report(report: Optional[dict]) -> str:
+    """Explain which function cases failed."""
+    if report is None:
+        return "The function cases could not be run."
+    if report.get("error"):
+        return report["error"]
+
+    lines = []
+    cases = report["cases"]
+    failed = [case for case in cases if not case["passed"]]
+    if len(cases) > 1 and len(failed) > 1:
+        lines.append(f"Passed {len(cases) - len(failed)} of {len(cases)} case(s).")
+    for case in failed[:10]:
+        if case["error"]:
+            lines.append(f"{case['call']} raised {case['error']}.")
+        else:
+            lines.append(f"{case['call']} returned {case['actual']}, expected {case['expected']}.")
+    if len(failed) > 10:
+        lines.append(f"...and {len(failed) - 10} more.")
+    return "\n".join(lines)
+
+
 def _generate_diff_hint(user_output: str, expected_output: str) -> str:
     """Generate a helpful hint about the difference between outputs."""
     user_lines = user_output.split("\n")
@@ -0,0 +1,217 @@
+"""Static checks that answer for code which cannot succeed, without running it.
+
+Two kinds of submission are common among failures and waste a worker:
+code with a syntax error, which fails the moment it is compiled, and a
+top-level loop that can never end, which holds a worker for the whole
+timeout. Both are detected in the server process before a worker is used.
+
+Loop detection is deliberately narrow: only a top-level `while` with a
+constant true condition is flagged, and only if nothing in its body can
+leave the loop. The body may not break, return, raise, call anything (a
+call could exit, raise or read input) or use an operation that can fail,
+and it may only read names that hold integers. Code before the loop that
+names a way to end the program (`exit`, `quit`, `sys.exit`, `os._exit`
+or `SystemExit`) may never reach it, so such a loop is not flagged
+either. Code that ends the program without naming it, say through
+getattr, is not recognized.
+"""
+
+import ast
+import traceback
+from typing import Optional
+
+from .structure import parse_submission
+
+# Operators that cannot raise when applied to int and bool operands
+_SAFE_BINARY_OPS = (ast.Add, ast.Sub, ast.Mult, ast.BitAnd, ast.BitOr, ast.BitXor)
+_SAFE_UNARY_OPS = (ast.UAdd, ast.USub, ast.Not)
+_SAFE_COMPARE_OPS = (ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Is, ast.IsNot)
+# Names of the ways code can end the whole program
+_EXIT_NAMES = frozenset({"exit", "quit", "_exit", "SystemExit"})
+
+
+def _safe_expression(node: ast.expr, numeric: set[str]) -> bool:
+    """Whether evaluating node yields an integer and cannot raise."""
+    if isinstance(node, ast.Constant):
+        return isinstance(node.value, int)
+    if isinstance(node, ast.Name):
+        return node.id in numeric
+    if isinstance(node, ast.BinOp):
+        return (
+            isinstance(node.op, _SAFE_BINARY_OPS)
+            and _safe_expression(node.left, numeric)
+            and _safe_expression(node.right, numeric)
+        )
+    if isinstance(node, ast.UnaryOp):
+        return isinstance(node.op, _SAFE_UNARY_OPS) and _safe_expression(node.operand, numeric)
+    if isinstance(node, ast.BoolOp):
+        return all(_safe_expression(value, numeric) for value in node.values)
+    if isinstance(node, ast.Compare):
+        return (
+            all(isinstance(op, _SAFE_COMPARE_OPS) for op in node.ops)
+            and _safe_expression(node.left, numeric)
+            and all(_safe_expression(c, numeric) for c in node.comparators)
+        )
+    if isinstance(node, ast.IfExp):
+        return all(_safe_expression(part, numeric) for part in (node.test, node.body, node.orelse))
+    return False
+
+
+def _numeric_names(tree: ast.Module) -> set[str]:
+    """Return the names that are only ever bound to integers, anywhere in the program."""
+    # name -> expressions it is assigned, with `x op= value` recorded as x op value
+    bindings: dict[str, list[ast.expr]] = {}
+    simple_targets = set()
+    disqualified = set()
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign) and all(isinstance(t, ast.Name) for t in node.targets):
+            for target in node.targets:
+                bindings.setdefault(target.id, []).append(node.value)
+                simple_targets.add(id(target))
+        elif isinstance(node, ast.AugAssign) and isinstance(node.target, ast.Name):
+            value = ast.BinOp(left=ast.Name(node.target.id, ast.Load()), op=node.op, right=node.value)
+            bindings.setdefault(node.target.id, []).append(value)
+            simple_targets.add(id(node.target))
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            disqualified.update(node.names)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            disqualified.add(node.name)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            disqualified.update((alias.asname or alias.name).split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.arg):
+            disqualified.add(node.arg)
+        elif isinstance(node, (ast.ExceptHandler, ast.MatchAs, ast.MatchStar)) and node.name:
+            disqualified.add(node.name)
+
+    # Any other binding (loop targets, unpacking, walrus, with-as, del) may hold anything
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and not isinstance(node.ctx, ast.Load) and id(node) not in simple_targets:
+            disqualified.add(node.id)
+
+    numeric = set(bindings) - disqualified
+    changed = True
+    while changed:
+        changed = False
+        for name in list(numeric):
+            if not all(_safe_expression(value, numeric) for value in bindings[name]):
+                numeric.discard(name)
+                changed = True
+    return numeric
+
+
+def _names_exit(statement: ast.stmt) -> bool:
+    """Whether statement mentions a way to end the program, even without calling it."""
+    for node in ast.walk(statement):
+        if isinstance(node, ast.Name) and node.id in _EXIT_NAMES:
+            return True
+        if isinstance(node, ast.Attribute) and node.attr in _EXIT_NAMES:
+            return True
+        if isinstance(node, ast.alias) and node.name in _EXIT_NAMES:
+            return True
+    return False
+
+
+def _always_true(test: ast.expr) -> bool:
+    return isinstance(test, ast.Constant) and bool(test.value)
+
+
+def _cannot_leave(statements: list[ast.stmt], numeric: set[str]) -> bool:
+    """Whether running statements can neither raise nor leave the enclosing loop."""
+    for statement in statements:
+        if isinstance(statement, (ast.Pass, ast.Continue)):
+            continue
+        if isinstance(statement, ast.Expr) and isinstance(statement.value, ast.Constant):
+            continue
+        if isinstance(statement, (ast.Assign, ast.AugAssign)):
+            targets = statement.targets if isinstance(statement, ast.Assign) else [statement.target]
+            if not all(isinstance(t, ast.Name) and t.id in numeric for t in targets):
+                return False
+            value = statement.value
+            if isinstance(statement, ast.AugAssign):
+                value = ast.BinOp(left=ast.Name(statement.target.id, ast.Load()), op=statement.op, right=value)
+            if not _safe_expression(value, numeric):
+                return False
+            continue
+        if isinstance(statement, ast.If):
+            if not (
+                _safe_expression(statement.test, numeric)
+                and _cannot_leave(statement.body, numeric)
+                and _cannot_leave(statement.orelse, numeric)
+            ):
+                return False
+            continue
+        # break, return, raise, calls, loops and everything else might end the loop
+        return False
+    return True
+
+
+def find_endless_loop(tree: ast.Module) -> Optional[ast.While]:
+    """
+    Find a top-level loop that can never end once it is reached.
+
+    Args:
+        tree: The parsed program
+
+    Returns:
+        The first such `while` statement, or None
+    """
+    loops = [
+        statement
+        for statement in tree.body
+        if isinstance(statement, ast.While) and _always_true(statement.test)
+    ]
+    if not loops:
+        return None
+
+    numeric = _numeric_names(tree)
+    assigned_before: set[str] = set()
+    for statement in tree.body:
+        if statement in loops and _cannot_leave(statement.body, numeric & assigned_before):
+            return statement
+        if _names_exit(statement):
+            # The program may end here, before any later loop is reached
+            return None
+        if isinstance(statement, ast.Assign):
+            assigned_before.update(t.id for t in statement.targets if isinstance(t, ast.Name))
+    return None
+
+
+def _failure(error: str) -> dict:
+    """Build the result of a run that was answered without running the code."""
+    return {"output": "", "error": error, "execution_time": 0.0, "success": False}
+
+
+def static_failure(code: str, compiles: bool = True) -> Optional[dict]:
+    """
+    Return the result of running code if it is certain to fail, without running it.
+
+    Args:
+        code: The Python code about to be executed
+        compiles: False if compiling the code already failed, so the error
+            is reported instead of looking for endless loops
+
+    Returns:
+        A dictionary with the ExecutionResult fields, or None if the code has to be run
+    """
+    if not compiles:
+        try:
+            compile(code, "<string>", "exec")
+        except (SyntaxError, ValueError) as e:
+            # Formatted like the traceback of the same error raised in a worker
+            details = "".join(traceback.format_exception_only(type(e), e))
+            return _failure(f"Traceback (most recent call last):\n{details}".strip())
+        except (RecursionError, MemoryError, OverflowError):
+            return None
+        return None
+
+    tree = parse_submission(code)
+    if tree is None:
+        return None
+    loop = find_endless_loop(tree)
+    if loop is None:
+        return None
+    return _failure(
+        f"Infinite loop: the while loop on line {loop.lineno} can never end, so your code was not run. "
+        "Add a condition that becomes false, or a break, so the loop can stop."
+    )
@@ -0,0 +1,128 @@
+"""Structural checks on the parse tree of a submission.
+
+Rules such as "assigns variable X", "defines function f with 2 params" or
+"uses a for loop" are answered from the AST, so a name that only appears
+in a comment or a string does not count. Each submission is parsed once;
+the tree is cached and shared by every rule and by the verdict cache.
+
+Test case formats:
+    {"check_type": "variable_exists", "variables": ["name", "age"]}
+    {"check_type": "assigns_variable", "variables": ["total"]}
+    {"check_type": "defines_function", "function": "add", "params": 2}
+    {"check_type": "uses_construct", "construct": "for"}
+"""
+
+import ast
+from functools import lru_cache
+from typing import Optional
+
+# Constructs that uses_construct rules can ask for: name -> (description, node types)
+CONSTRUCTS: dict[str, tuple[str, tuple[type, ...]]] = {
+    "for": ("a for loop", (ast.For, ast.AsyncFor)),
+    "while": ("a while loop", (ast.While,)),
+    "if": ("an if statement", (ast.If, ast.IfExp)),
+    "function": ("a function definition", (ast.FunctionDef, ast.AsyncFunctionDef)),
+    "class": ("a class", (ast.ClassDef,)),
+    "return": ("a return statement", (ast.Return,)),
+    "lambda": ("a lambda", (ast.Lambda,)),
+    "try": ("a try statement", (ast.Try, ast.TryStar)),
+    "with": ("a with statement", (ast.With, ast.AsyncWith)),
+    "import": ("an import", (ast.Import, ast.ImportFrom)),
+    "list_comprehension": ("a list comprehension", (ast.ListComp,)),
+    "dict_comprehension": ("a dict comprehension", (ast.DictComp,)),
+    "set_comprehension": ("a set comprehension", (ast.SetComp,)),
+    "comprehension": ("a comprehension", (ast.ListComp, ast.DictComp, ast.SetComp, ast.GeneratorExp)),
+    "f_string": ("an f-string", (ast.JoinedStr,)),
+}
+
+STRUCTURAL_CHECKS = frozenset({"variable_exists", "assigns_variable", "defines_function", "uses_construct"})
+
+# Longest submission, in characters, whose parse tree is memoized. A tree
+# takes around a hundred times the memory of its source, so larger ones
+# are parsed again whenever they are needed.
+MAX_CACHED_LENGTH = 4096
+
+
+def parse_submission(code: str) -> Optional[ast.Module]:
+    """Parse a submission, or return None if it does not parse.
+
+    Memoized up to MAX_CACHED_LENGTH, so every check of the same submission
+    shares one tree. Callers must not modify the returned tree.
+    """
+    if len(code) > MAX_CACHED_LENGTH:
+        return _parse(code)
+    return _parse_cached(code)
+
+
+def _parse(code: str) -> Optional[ast.Module]:
+    try:
+        return ast.parse(code)
+    except (SyntaxError, ValueError, RecursionError, MemoryError):
+        return None
+
+
+_parse_cached = lru_cache(maxsize=256)(_parse)
+
+
+def assigned_names(tree: ast.AST) -> set[str]:
+    """Return the names a program binds: assignments, loop targets, defs and imports."""
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+            names.add(node.id)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                names.add(alias.asname or alias.name.split(".")[0])
+    return names
+
+
+def _positional_params(function: ast.AST) -> int:
+    return len(function.args.posonlyargs) + len(function.args.args)
+
+
+def check_structure(tree: ast.Module, test_case: dict) -> Optional[str]:
+    """
+    Check one structural rule against a parse tree.
+
+    Args:
+        tree: The parsed submission
+        test_case: A test case whose check_type is in STRUCTURAL_CHECKS
+
+    Returns:
+        None if the rule holds, otherwise a message saying what is missing
+    """
+    check_type = test_case.get("check_type")
+
+    if check_type in ("variable_exists", "assigns_variable"):
+        bound = assigned_names(tree)
+        missing = [var for var in test_case.get("variables", []) if var not in bound]
+        if missing:
+            return f"Missing required variable(s): {', '.join(missing)}"
+        return None
+
+    if check_type == "defines_function":
+        name = test_case.get("function")
+        params = test_case.get("params")
+        definitions = [
+            node
+            for node in ast.walk(tree)
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == name
+        ]
+        if not definitions:
+            return f"Missing required function: {name}"
+        if params is not None and all(_positional_params(node) != params for node in definitions):
+            return f"Function {name} should take {params} parameter(s)."
+        return None
+
+    if check_type == "uses_construct":
+        construct = test_case.get("construct")
+        if construct not in CONSTRUCTS:
+            raise ValueError(f"Unknown construct: {construct!r}")
+        description, node_types = CONSTRUCTS[construct]
+        if not any(isinstance(node, node_types) for node in ast.walk(tree)):
+            return f"Your solution should use {description}."
+        return None
+
+    raise ValueError(f"Not a structural check: {check_type!r}")
@@ -0,0 +1,64 @@
+"""Per-problem execution time budgets derived from reference runtimes.
+
+A problem whose reference solution runs in a millisecond does not need a
+five-second timeout: a submission still running long after the reference
+finished is almost certainly stuck. Each problem's budget is a multiple of
+the 99th percentile of its measured reference runtimes (see
+engine.reference), clamped between a floor and a ceiling. Requested
+timeouts are capped at the budget, and at the ceiling when no runtimes
+have been measured, so no client can hold a worker for longer. They are
+also raised to the floor, so a zero or negative timeout still gives the
+code a chance to run.
+"""
+
+import math
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+from .reference_registry import get_reference_registry
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of non-empty samples."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+@dataclass
+class TimeBudget:
+    """How timeouts are derived from reference runtimes."""
+
+    multiplier: float = 20.0
+    floor: float = 1.0
+    ceiling: float = 10.0
+
+    def for_problem(self, problem_id: Optional[str]) -> float:
+        """Return the time budget of a problem, or the ceiling if its runtime is unknown."""
+        result = get_reference_registry().get(problem_id) if problem_id is not None else None
+        if result is None or not result.passed or not result.runtimes:
+            return self.ceiling
+        budget = self.multiplier * percentile(result.runtimes, 0.99)
+        return min(self.ceiling, max(self.floor, budget))
+
+    def clamp(self, timeout: float, problem_id: Optional[str] = None) -> float:
+        """Bring a requested timeout between the floor and the budget of the problem it is for."""
+        return min(max(self.floor, timeout), self.for_problem(problem_id))
+
+
+_budget = TimeBudget()
+_budget_lock = threading.Lock()
+
+
+def get_time_budget() -> TimeBudget:
+    """Get the shared time budget policy."""
+    return _budget
+
+
+def configure_time_budget(multiplier: float, floor: float, ceiling: float) -> TimeBudget:
+    """Replace the shared time budget policy."""
+    global _budget
+    with _budget_lock:
+        _budget = TimeBudget(multiplier, floor, ceiling)
+        return _budget
@@ -0,0 +1,477 @@
+"""Pool of pre-forked worker processes that execute user code.
+
+Each worker is a separate process with its own interpreter, so submissions
+run in parallel across cores instead of sharing the GIL of the server.
+Workers are started up front and reused for every request. A run that
+exceeds its timeout or resource limits is stopped by killing its worker,
+which is replaced by a fresh process, so runaway code never keeps burning
+CPU or holding memory after its result has been returned.
+"""
+
+import multiprocessing
+import os
+import queue
+import shutil
+import signal
+import tempfile
+import threading
+import time
+from functools import partial
+from typing import Callable, Iterator, Optional
+
+from .code_cache import get_code_cache
+from .static_checks import static_failure
+from .sandbox import (
+    ExecutionLimits,
+    execute,
+    output_buffer,
+    resource_limits,
+    run_code,
+    timeout_message,
+)
+
+
+class _ChunkForwarder:
+    """Batches output written inside a worker and sends it to the parent in chunks.
+
+    Pending text is sent once it reaches FLUSH_SIZE characters, and at least
+    every FLUSH_INTERVAL seconds by a background thread, so slow programs
+    still show their output promptly.
+    """
+
+    FLUSH_INTERVAL = 0.05
+    FLUSH_SIZE = 4096
+
+    def __init__(self, send: Callable[[tuple], None]):
+        self._send = send
+        self._pending: list[list[str]] = []
+        self._pending_size = 0
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._flush_periodically, daemon=True)
+        self._thread.start()
+
+    def write(self, stream: str, text: str) -> None:
+        """Queue text written to stdout or stderr."""
+        with self._lock:
+            if self._pending and self._pending[-1][0] == stream:
+                self._pending[-1][1] += text
+            else:
+                self._pending.append([stream, text])
+            self._pending_size += len(text)
+            if self._pending_size >= self.FLUSH_SIZE:
+                self._flush()
+
+    def _flush(self) -> None:
+        for stream, text in self._pending:
+            self._send(("chunk", stream, text))
+        self._pending = []
+        self._pending_size = 0
+
+    def _flush_periodically(self) -> None:
+        while not self._stopped.wait(self.FLUSH_INTERVAL):
+            with self._lock:
+                self._flush()
+
+    def close(self) -> None:
+        """Stop the flushing thread and send whatever is still pending."""
+        self._stopped.set()
+        self._thread.join()
+        with self._lock:
+            self._flush()
+
+
+# Seconds a worker waits for threads started by a run to end before it reports them
+LINGER_GRACE = 0.05
+
+
+def _clear_directory(path: str) -> None:
+    """Remove everything inside a directory, keeping the directory itself."""
+    for entry in os.scandir(path):
+        if entry.is_dir(follow_symlinks=False):
+            shutil.rmtree(entry.path, ignore_errors=True)
+        else:
+            try:
+                os.unlink(entry.path)
+            except OSError:
+                pass
+
+
+def _worker_main(conn, workdir: str) -> None:
+    """Serve execution requests from the parent until the pipe is closed.
+
+    Each request is answered with a ("result", dict, lingering) message,
+    preceded by ("chunk", stream, text) messages if the parent asked for
+    live output. lingering is set when threads the code started are still
+    running; the parent then replaces the worker, so they cannot write into
+    a later run. Code runs with workdir, emptied before every run, as the
+    working directory, so files it writes neither land where the server was
+    started nor leak into the next run.
+    """
+    # Ctrl+C is handled by the parent, which shuts the pool down.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    send_lock = threading.Lock()
+
+    def send(message: tuple) -> None:
+        with send_lock:
+            conn.send(message)
+
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+        code, limits, forward_output, options = request
+        threads_before = threading.active_count()
+        _clear_directory(workdir)
+        os.chdir(workdir)
+        output_capture = output_buffer(limits)
+        error_capture = output_buffer(limits)
+        forwarder = None
+        if forward_output:
+            forwarder = _ChunkForwarder(send)
+            output_capture.on_write = partial(forwarder.write, "stdout")
+            error_capture.on_write = partial(forwarder.write, "stderr")
+        with resource_limits(limits):
+            result = execute(code, output_capture, error_capture, **options)
+        if forwarder is not None:
+            forwarder.close()
+        send(("result", result, _threads_outlived(threads_before)))
+    conn.close()
+
+
+def _threads_outlived(threads_before: int) -> bool:
+    """Whether threads started by the last run are still running, after a moment to finish."""
+    deadline = time.monotonic() + LINGER_GRACE
+    while threading.active_count() > threads_before:
+        if time.monotonic() >= deadline:
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def _default_start_method() -> str:
+    """Prefer fork so workers start warm with the engine already imported."""
+    if "fork" in multiprocessing.get_all_start_methods():
+        return "fork"
+    return "spawn"
+
+
+def _failure(error: str, execution_time: float) -> dict:
+    """Build the result of a run that was stopped by the pool."""
+    return {
+        "output": "",
+        "error": error,
+        "execution_time": execution_time,
+        "success": False,
+        "interrupted": True,
+    }
+
+
+_CANCELLED = "Execution was cancelled."
+_SHUT_DOWN = "Execution worker pool was shut down."
+
+
+def _exit_message(exitcode: Optional[int]) -> str:
+    """Explain why a worker process died while running code."""
+    if hasattr(signal, "SIGXCPU") and exitcode == -signal.SIGXCPU:
+        return "CPU time limit exceeded."
+    return "Execution worker exited unexpectedly."
+
+
+class _Worker:
+    """A single worker process and the parent's end of its pipe."""
+
+    def __init__(self, context):
+        # Scratch working directory of the code this worker runs
+        self.workdir = tempfile.mkdtemp(prefix="python-coach-worker-")
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, self.workdir), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def stop(self) -> None:
+        """Ask the worker to exit, killing it if it does not."""
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(1.0)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+class Cancellation:
+    """Lets another thread stop a streamed run, e.g. when its client goes away.
+
+    Cancelling kills the worker running the code, so the stream ends at
+    once rather than when the code next produces output or times out.
+    Runs in a pool of size 0 cannot be stopped and are left to finish.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._worker: Optional[_Worker] = None
+        self._killed = False
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        """Stop the run, or keep it from starting if it has not yet."""
+        with self._lock:
+            self.cancelled = True
+            if self._worker is not None and not self._killed:
+                self._worker.process.kill()
+                self._killed = True
+
+    def _attach(self, worker: _Worker) -> bool:
+        """Note the worker running the code; returns False if already cancelled."""
+        with self._lock:
+            if self.cancelled:
+                return False
+            self._worker = worker
+            return True
+
+    def _detach(self) -> bool:
+        """Forget the worker once the run is over; returns whether it was killed."""
+        with self._lock:
+            self._worker = None
+            return self._killed
+
+
+class WorkerPool:
+    """A fixed-size pool of pre-forked processes that run user code.
+
+    A pool of size 0 runs code in the calling process instead, which is
+    useful on platforms without multiprocessing support and for debugging.
+    """
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        start_method: Optional[str] = None,
+        limits: Optional[ExecutionLimits] = None,
+    ):
+        """Initialize the pool.
+
+        Args:
+            size: Number of worker processes. Defaults to the CPU count.
+            start_method: multiprocessing start method. Defaults to fork where available.
+            limits: Default resource limits applied to every run.
+        """
+        self.size = (os.cpu_count() or 1) if size is None else max(0, size)
+        self.limits = limits
+        self._context = multiprocessing.get_context(start_method or _default_start_method())
+        self._workers: list[_Worker] = []
+        # Idle workers, and None once the pool is shut down to wake anyone waiting
+        self._idle: queue.Queue[Optional[_Worker]] = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = False
+
+    def start(self) -> None:
+        """Start all worker processes so they are warm before the first request."""
+        with self._lock:
+            if self._started or self._closed:
+                return
+            for _ in range(self.size):
+                worker = _Worker(self._context)
+                self._workers.append(worker)
+                self._idle.put(worker)
+            self._started = True
+
+    def shutdown(self) -> None:
+        """Stop all worker processes.
+
+        The pool cannot be used afterwards: runs waiting for a worker, and
+        any started later, get a failure result instead.
+        """
+        with self._lock:
+            self._closed = True
+            for worker in self._workers:
+                worker.stop()
+            self._workers = []
+            self._idle.put(None)
+
+    def run(
+        self,
+        code: str,
+        timeout: float,
+        limits: Optional[ExecutionLimits] = None,
+        calls: Optional[list[dict]] = None,
+        full_report: bool = False,
+        expected_output: Optional[str] = None,
+    ) -> dict:
+        """Execute code on an idle worker, waiting for one if all are busy.
+
+        If the code is still running when the timeout expires, its worker is
+        killed and replaced.
+
+        Args:
+            code: The Python code to execute
+            timeout: Maximum execution time in seconds
+            limits: Resource limits for this run. Defaults to the pool's limits.
+            calls: Optional function call groups to run after the code (see engine.harness)
+            full_report: Whether to run every case instead of stopping at the first failure
+            expected_output: Normalized output the program must produce; the run
+                stops early once its output runs past it (see engine.output_matcher)
+
+        Returns:
+            Dictionary with the ExecutionResult fields
+        """
+        events = self.stream(code, timeout, limits, False, calls, full_report, expected_output)
+        for kind, payload in events:
+            if kind == "result":
+                return payload
+
+    def stream(
+        self,
+        code: str,
+        timeout: float,
+        limits: Optional[ExecutionLimits] = None,
+        forward_output: bool = True,
+        calls: Optional[list[dict]] = None,
+        full_report: bool = False,
+        expected_output: Optional[str] = None,
+        cancel: Optional[Cancellation] = None,
+    ) -> Iterator[tuple[str, object]]:
+        """Execute code on an idle worker, yielding its output as it is produced.
+
+        Yields ("stdout", text) and ("stderr", text) chunks while the code
+        runs, then a final ("result", dict) with the ExecutionResult fields.
+        Closing the generator early kills the run, and so does cancel from
+        any thread while the generator is waiting. The code is compiled
+        through the shared code cache and sent to the worker as bytecode;
+        code that does not compile or certainly never ends is answered
+        without a worker (see engine.static_checks).
+
+        Args:
+            code: The Python code to execute
+            timeout: Maximum execution time in seconds
+            limits: Resource limits for this run. Defaults to the pool's limits.
+            forward_output: Whether to yield output chunks before the result
+            calls: Optional function call groups to run after the code (see engine.harness)
+            full_report: Whether to run every case instead of stopping at the first failure
+            expected_output: Normalized output the program must produce; the run
+                stops early once its output runs past it (see engine.output_matcher)
+            cancel: Optional handle another thread can use to stop the run
+        """
+        limits = limits or self.limits
+        program = get_code_cache().get(code)
+        failure = static_failure(code, compiles=program is not None)
+        if failure is not None:
+            yield "result", failure
+            return
+        program = program or code
+
+        if self.size == 0:
+            result = run_code(program, timeout, limits, calls, full_report, expected_output)
+            if forward_output and result["output"]:
+                yield "stdout", result["output"]
+            yield "result", result
+            return
+
+        self.start()
+        worker = self._idle.get()
+        if worker is None:
+            # Pass the wake-up on to the next waiter
+            self._idle.put(None)
+            yield "result", _failure(_SHUT_DOWN, 0.0)
+            return
+        if cancel is not None and not cancel._attach(worker):
+            self._release(worker)
+            yield "result", _failure(_CANCELLED, 0.0)
+            return
+        start_time = time.time()
+        deadline = start_time + timeout
+        finished = False
+        try:
+            options = {"calls": calls, "full_report": full_report, "expected_output": expected_output}
+            worker.conn.send((program, limits, forward_output, options))
+            while True:
+                if not worker.conn.poll(max(0.0, deadline - time.time())):
+                    result = _failure(timeout_message(timeout), timeout)
+                    break
+                message = worker.conn.recv()
+                if message[0] == "chunk":
+                    yield message[1], message[2]
+                    continue
+                result = message[1]
+                # Threads left running by the code would write into the next run
+                finished = not message[2]
+                break
+        except (EOFError, OSError):
+            worker.process.join(1.0)
+            if cancel is not None and cancel.cancelled:
+                result = _failure(_CANCELLED, time.time() - start_time)
+            else:
+                result = _failure(_exit_message(worker.process.exitcode), time.time() - start_time)
+        finally:
+            # A cancelled worker may have been killed after delivering its result
+            if cancel is not None and cancel._detach():
+                finished = False
+            # A worker that did not deliver its result may still be running
+            if not finished:
+                worker = self._replace(worker)
+            if worker is not None:
+                self._release(worker)
+        yield "result", result
+
+    def _release(self, worker: _Worker) -> None:
+        """Make a worker available again, unless the pool has been shut down."""
+        with self._lock:
+            if not self._closed:
+                self._idle.put(worker)
+
+    def _replace(self, worker: _Worker) -> Optional[_Worker]:
+        """Kill a worker and start a fresh one in its place, unless the pool has been shut down."""
+        worker.process.kill()
+        worker.process.join()
+        worker.conn.close()
+        shutil.rmtree(worker.workdir, ignore_errors=True)
+        with self._lock:
+            if self._closed:
+                return None
+            replacement = _Worker(self._context)
+            self._workers = [replacement if w is worker else w for w in self._workers]
+        return replacement
+
+
+_pool: Optional[WorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_worker_pool() -> WorkerPool:
+    """Get the shared worker pool, starting a default-sized one if needed."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = WorkerPool()
+            _pool.start()
+        return _pool
+
+
+def start_worker_pool(
+    size: Optional[int] = None, limits: Optional[ExecutionLimits] = None
+) -> WorkerPool:
+    """Start the shared worker pool with the given size, replacing any existing pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = WorkerPool(size, limits=limits)
+        _pool.start()
+        return _pool
+
+
+def shutdown_worker_pool() -> None:
+    """Stop the shared worker pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
@@ -3,7 +3,7 @@
 "use client";
 
 import { useEffect, useState } from "react";
-import { Problem } from "@/types";
+import { ProblemSummary } from "@/types";
 import { problemsApi } from "@/lib/api/client";
 import { useProgressStore } from "@/lib/store/progressStore";
 import { ProblemCard } from "@/components/problem/ProblemCard";
@@ -14,8 +14,8 @@ import { Card } from "@/components/ui/Card";
 import Link from "next/link";
 
 export default function HomePage() {
-  const [problems, setProblems] = useState<Problem[]>([]);
-  const [filteredProblems, setFilteredProblems] = useState<Problem[]>([]);
+  const [problems, setProblems] = useState<ProblemSummary[]>([]);
+  const [filteredProblems, setFilteredProblems] = useState<ProblemSummary[]>([]);
   const [selectedCategory, setSelectedCategory] = useState("All");
   const [selectedDifficulty, setSelectedDifficulty] = useState("All");
   const [loading, setLoading] = useState(true);
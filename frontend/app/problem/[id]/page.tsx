@@ -4,7 +4,7 @@
 
 import { useEffect, useState } from "react";
 import { useParams, useRouter } from "next/navigation";
-import { Problem, ExecutionResult, CheckResult } from "@/types";
+import { Problem, ProblemSummary, ExecutionResult, CheckResult } from "@/types";
 import { problemsApi, executeApi, checkApi } from "@/lib/api/client";
 import { useProgressStore } from "@/lib/store/progressStore";
 import { ProblemCard } from "@/components/problem/ProblemCard";
@@ -25,7 +25,7 @@ export default function ProblemPage() {
   const problemId = params.id as string;
 
   const [problem, setProblem] = useState<Problem | null>(null);
-  const [allProblems, setAllProblems] = useState<Problem[]>([]);
+  const [allProblems, setAllProblems] = useState<ProblemSummary[]>([]);
   const [code, setCode] = useState("");
   const [executionResult, setExecutionResult] = useState<ExecutionResult | null>(null);
   const [checkResult, setCheckResult] = useState<CheckResult | null>(null);
@@ -48,7 +48,7 @@ export default function ProblemPage() {
         
         const all = allProblemsData.problems;
         setAllProblems(all);
-        const index = all.findIndex((p: Problem) => p.id === problemId);
+        const index = all.findIndex((p: ProblemSummary) => p.id === problemId);
         setCurrentProblemIndex(index);
       } catch (error) {
         console.error("Failed to load problem:", error);
@@ -2,14 +2,14 @@
 
 "use client";
 
-import { Problem } from "@/types";
+import { ProblemSummary } from "@/types";
 import { Badge } from "@/components/ui/Badge";
 import { useProgressStore } from "@/lib/store/progressStore";
 import { Check } from "lucide-react";
 import Link from "next/link";
 
 interface SidebarProps {
-  problems: Problem[];
+  problems: ProblemSummary[];
   selectedCategory?: string;
   selectedDifficulty?: string;
   onCategoryChange?: (category: string) => void;
@@ -2,13 +2,13 @@
 
 "use client";
 
-import { Problem } from "@/types";
+import { Problem, ProblemSummary } from "@/types";
 import { Card } from "@/components/ui/Card";
 import { Badge } from "@/components/ui/Badge";
 import { Check } from "lucide-react";
 
 interface ProblemCardProps {
-  problem: Problem;
+  problem: Problem | ProblemSummary;
   isCompleted?: boolean;
 }
 
@@ -41,11 +41,13 @@ export function ProblemCard({ problem, isCompleted = false }: ProblemCardProps)
         </div>
       </div>
 
-      <div className="prose dark:prose-invert max-w-none">
-        <div className="text-gray-700 dark:text-gray-300 whitespace-pre-wrap">
-          {problem.description}
+      {"description" in problem && (
+        <div className="prose dark:prose-invert max-w-none">
+          <div className="text-gray-700 dark:text-gray-300 whitespace-pre-wrap">
+            {problem.description}
+          </div>
         </div>
-      </div>
+      )}
     </Card>
   );
 }
@@ -1,5 +1,13 @@
 /** TypeScript type definitions for Python Coach */
 
+export interface ProblemSummary {
+  id: string;
+  title: string;
+  difficulty: "Beginner" | "Intermediate" | "Advanced";
+  category: string;
+  points: number;
+}
+
 export interface Problem {
   id: string;
   title: string;
@@ -18,6 +26,7 @@ export interface ExecutionResult {
   error: string | null;
   execution_time: number;
   success: boolean;
+  truncated?: boolean;
 }
 
 export interface CheckResult {
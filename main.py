@@ -21,8 +21,6 @@ from ui.components import (
     render_welcome_message,
     render_score_header,
     render_progress_section,
-    calculate_total_points,
-    calculate_earned_points,
 )
 
 # Page configuration
@@ -83,10 +81,16 @@ st.markdown(
 )
 
 
+@st.cache_resource
+def get_problem_loader() -> ProblemLoader:
+    """Get the problem loader shared by all sessions."""
+    return ProblemLoader()
+
+
 def initialize_session_state():
     """Initialize session state variables."""
     if "problem_loader" not in st.session_state:
-        st.session_state.problem_loader = ProblemLoader()
+        st.session_state.problem_loader = get_problem_loader()
 
     # Initialize progress manager and load saved progress
     if "progress_manager" not in st.session_state:
@@ -146,12 +150,12 @@ def main():
     initialize_session_state()
 
     loader = st.session_state.problem_loader
-    problems = loader.get_all_problems()
+    problems = loader.get_problem_summaries()
     completed_ids = st.session_state.completed_problems
 
     # Calculate and render score header
-    total_points = calculate_total_points(problems)
-    earned_points = calculate_earned_points(problems, completed_ids)
+    total_points = loader.total_points
+    earned_points = loader.get_points(completed_ids)
     render_score_header(earned_points, total_points)
 
     # Render sidebar and get selections
@@ -162,6 +166,9 @@ def main():
         selected_category=st.session_state.selected_category,
         selected_difficulty=st.session_state.selected_difficulty,
         completed_problem_ids=completed_ids,
+        search=lambda query, category, difficulty: [
+            summary for summary, _ in loader.search(query, category=category, difficulty=difficulty, limit=50)
+        ],
     )
 
     # Render progress section with reset button
@@ -1,6 +1,22 @@
 """Problem library module for Python Coach."""
 
 from .problem_loader import ProblemLoader, get_categories, get_difficulties
+from .problem_record import (
+    DIFFICULTY_POINTS,
+    Difficulty,
+    ProblemSummary,
+    get_problem_points,
+    summarize_problem,
+)
 
-__all__ = ["ProblemLoader", "get_categories", "get_difficulties"]
+__all__ = [
+    "DIFFICULTY_POINTS",
+    "Difficulty",
+    "ProblemLoader",
+    "ProblemSummary",
+    "get_categories",
+    "get_difficulties",
+    "get_problem_points",
+    "summarize_problem",
+]
 
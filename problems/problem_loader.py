@@ -1,53 +1,317 @@
 """Problem loader module for managing Python learning problems."""
 
-import json
+import logging
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Optional
+
+from .problem_pack import ProblemPack, StalePackError
+from .problem_record import ProblemSummary, summarize_problem
+from .search_index import SearchIndex
+
+logger = logging.getLogger(__name__)
+
+
+class _ProblemIndex:
+    """An immutable snapshot of the library: summaries, indexes and totals.
+
+    A reload builds a new snapshot and swaps it in with one assignment, so
+    a request that picked up the old snapshot keeps a consistent view.
+    """
+
+    def __init__(
+        self, pack: ProblemPack, summaries: Iterable[ProblemSummary], search: SearchIndex, cache_size: int
+    ):
+        self.pack = pack
+        self.search = search
+        # Counts the snapshots a loader has swapped in
+        self.version = 0
+        self.summaries: list[ProblemSummary] = []
+        self.by_id: dict[str, ProblemSummary] = {}
+        self.by_category: dict[str, list[ProblemSummary]] = {}
+        self.by_difficulty: dict[str, list[ProblemSummary]] = {}
+        self.by_category_difficulty: dict[tuple[str, str], list[ProblemSummary]] = {}
+        self.category_points: dict[str, int] = {}
+        self.difficulty_points: dict[str, int] = {}
+        self.total_points = 0
+
+        for summary in summaries:
+            category = summary.category
+            difficulty = summary.difficulty
+            points = summary.points
+            self.summaries.append(summary)
+            self.by_id[summary.id] = summary
+            self.by_category.setdefault(category, []).append(summary)
+            self.by_difficulty.setdefault(difficulty, []).append(summary)
+            self.by_category_difficulty.setdefault((category, difficulty), []).append(summary)
+            self.category_points[category] = self.category_points.get(category, 0) + points
+            self.difficulty_points[difficulty] = self.difficulty_points.get(difficulty, 0) + points
+            self.total_points += points
+        self.digests = pack.digests()
+
+        # Recently read full problems
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, dict] = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path, cache_size: int) -> "_ProblemIndex":
+        pack = ProblemPack(path)
+        search = SearchIndex()
+        summaries = []
+        for problem in pack.scan():
+            summaries.append(summarize_problem(problem))
+            search.add(problem)
+        return cls(pack, summaries, search.finish(), cache_size)
+
+    def read(self, problem_id: str) -> Optional[dict]:
+        """Return a full problem, reading it from the pack on a cache miss.
+
+        Raises:
+            StalePackError: If the library file changed since this snapshot was built
+        """
+        with self._cache_lock:
+            problem = self._cache.get(problem_id)
+            if problem is not None:
+                self._cache.move_to_end(problem_id)
+                return problem
+        if problem_id not in self.by_id:
+            return None
+
+        problem = self.pack.read(problem_id)
+        with self._cache_lock:
+            self._cache[problem_id] = problem
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return problem
 
 
 class ProblemLoader:
-    """Loads and manages problems from the JSON problem library."""
+    """Loads and manages problems from the JSON problem library.
+
+    Only compact problem summaries (see problem_record) are kept in memory,
+    indexed by id, category and difficulty at load time with per-category
+    and per-difficulty counts and point totals, so lookups and filters do
+    not scan the library. Full problems are read from the library file on
+    demand through an offset index (see problem_pack) and the most recently
+    used ones are cached. A ranked full-text index over titles, descriptions
+    and hints is built in the same pass (see search_index). Returned lists
+    and dicts are shared and must not be modified.
+
+    The loader can watch the library file and reload it in the background
+    when it changes (see start_watching). Listeners added with
+    add_reload_listener are told which problem ids changed.
+    """
+
+    def __init__(self, cache_size: int = 256, problems_file: Optional[Path] = None):
+        """Initialize the loader.
+
+        Args:
+            cache_size: Number of full problems kept in memory.
+            problems_file: Library file to load; defaults to the bundled problems.json.
+        """
+        self.problems_file = problems_file or Path(__file__).parent / "problems.json"
+        self.cache_size = cache_size
+        self._file_state = self._stat()
+        self._failed_state: Optional[tuple[int, int]] = None
+        self._index = _ProblemIndex.load(self.problems_file, cache_size)
+        self._reload_lock = threading.Lock()
+        self._listeners: list[Callable[[set[str]], None]] = []
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+
+    @property
+    def version(self) -> int:
+        """How many times new problem data has been swapped in; key anything derived from it on this."""
+        return self._index.version
+
+    @property
+    def total_points(self) -> int:
+        """Total points available across the library."""
+        return self._index.total_points
+
+    def _stat(self) -> Optional[tuple[int, int]]:
+        """Return the modification time and size of the library file."""
+        try:
+            stat = self.problems_file.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload(self, force: bool = False) -> set[str]:
+        """
+        Reload the library if its file changed, swapping in the new indexes at once.
 
-    def __init__(self):
-        self.problems_file = Path(__file__).parent / "problems.json"
-        self.problems = self._load_problems()
+        Args:
+            force: Reload even if the file's modification time and size are unchanged
 
-    def _load_problems(self) -> list[dict]:
-        """Load problems from JSON file."""
-        if not self.problems_file.exists():
-            return []
-        with open(self.problems_file, "r", encoding="utf-8") as f:
-            return json.load(f)
+        Returns:
+            Ids of problems that were added, removed or changed
+
+        Raises:
+            ValueError: If the file is not a valid library; the old one is kept
+        """
+        with self._reload_lock:
+            file_state = self._stat()
+            if file_state == self._file_state and not force:
+                return set()
+            old = self._index
+            new = _ProblemIndex.load(self.problems_file, self.cache_size)
+            new.version = old.version + 1
+            self._index = new
+            self._file_state = file_state
+
+        changed = {
+            problem_id
+            for problem_id in old.digests.keys() | new.digests.keys()
+            if old.digests.get(problem_id) != new.digests.get(problem_id)
+        }
+        if changed:
+            for listener in list(self._listeners):
+                listener(changed)
+        return changed
+
+    def add_reload_listener(self, listener: Callable[[set[str]], None]) -> None:
+        """Call listener with the changed problem ids after every reload that changes any."""
+        self._listeners.append(listener)
+
+    def start_watching(self, interval: float = 2.0) -> None:
+        """Poll the library file in a background thread and reload it when it changes."""
+        if self._watcher is not None:
+            return
+        self._stop_watching.clear()
+        self._watcher = threading.Thread(
+            target=self._watch, args=(interval,), name="problem-watcher", daemon=True
+        )
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        """Stop the background watcher."""
+        if self._watcher is None:
+            return
+        self._stop_watching.set()
+        self._watcher.join()
+        self._watcher = None
+
+    def _watch(self, interval: float) -> None:
+        while not self._stop_watching.wait(interval):
+            file_state = self._stat()
+            if file_state == self._failed_state:
+                continue
+            try:
+                self.reload()
+            except Exception as e:
+                # Possibly caught mid-write; keep serving the old snapshot until
+                # the file changes again. Anything else must not stop the watcher either.
+                self._failed_state = file_state
+                logger.warning("Could not reload %s: %s", self.problems_file, e)
 
     def get_all_problems(self) -> list[dict]:
-        """Return all problems."""
-        return self.problems
+        """Return all problems with every field. Reads the whole library; prefer summaries."""
+        return [self.get_problem_by_id(summary.id) for summary in self._index.summaries]
 
     def get_problem_by_id(self, problem_id: str) -> Optional[dict]:
-        """Get a specific problem by its ID."""
-        for problem in self.problems:
-            if problem["id"] == problem_id:
-                return problem
-        return None
+        """Get a specific problem by its ID, with every field."""
+        index = self._index
+        try:
+            return index.read(problem_id)
+        except StalePackError:
+            pass
+        # The file changed under this snapshot; load the new one and look again
+        try:
+            self.reload(force=self._index is index)
+            return self._index.read(problem_id)
+        except (OSError, ValueError, StalePackError) as e:
+            logger.warning("Could not read problem %s from %s: %s", problem_id, self.problems_file, e)
+            return None
+
+    def get_problem_summaries(
+        self, category: Optional[str] = None, difficulty: Optional[str] = None
+    ) -> list[ProblemSummary]:
+        """Return problem summaries, optionally filtered by category and/or difficulty."""
+        index = self._index
+        by_category = bool(category) and category != "All"
+        by_difficulty = bool(difficulty) and difficulty != "All"
+        if by_category and by_difficulty:
+            return index.by_category_difficulty.get((category, difficulty), [])
+        if by_category:
+            return index.by_category.get(category, [])
+        if by_difficulty:
+            return index.by_difficulty.get(difficulty, [])
+        return index.summaries
+
+    def get_problem_summary(self, problem_id: str) -> Optional[ProblemSummary]:
+        """Get the summary of a specific problem by its ID."""
+        return self._index.by_id.get(problem_id)
+
+    def search(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        limit: int = 20,
+    ) -> list[tuple[ProblemSummary, float]]:
+        """
+        Rank problems by how well their title, description and hints match a query.
+
+        The last word of the query also matches longer words it starts, for type-ahead.
+
+        Args:
+            query: Search text
+            category: Only search this category, if given and not "All"
+            difficulty: Only search this difficulty level, if given and not "All"
+            limit: Most results to return
+
+        Returns:
+            (summary, relevance score) pairs of the matching problems, best first
+        """
+        index = self._index
+        category = category if category and category != "All" else None
+        difficulty = difficulty if difficulty and difficulty != "All" else None
+        return [
+            (index.by_id[problem_id], score)
+            for problem_id, score in index.search.search(query, limit, category, difficulty)
+        ]
 
     def get_problems_by_category(self, category: str) -> list[dict]:
         """Get all problems in a specific category."""
-        return [p for p in self.problems if p["category"] == category]
+        return self._full(self._index.by_category.get(category, []))
 
     def get_problems_by_difficulty(self, difficulty: str) -> list[dict]:
         """Get all problems of a specific difficulty level."""
-        return [p for p in self.problems if p["difficulty"] == difficulty]
+        return self._full(self._index.by_difficulty.get(difficulty, []))
 
     def filter_problems(
         self, category: Optional[str] = None, difficulty: Optional[str] = None
     ) -> list[dict]:
         """Filter problems by category and/or difficulty."""
-        filtered = self.problems
-        if category and category != "All":
-            filtered = [p for p in filtered if p["category"] == category]
-        if difficulty and difficulty != "All":
-            filtered = [p for p in filtered if p["difficulty"] == difficulty]
-        return filtered
+        return self._full(self.get_problem_summaries(category, difficulty))
+
+    def _full(self, summaries: list[ProblemSummary]) -> list[dict]:
+        problems = (self.get_problem_by_id(summary.id) for summary in summaries)
+        return [problem for problem in problems if problem is not None]
+
+    def get_category_counts(self) -> dict[str, int]:
+        """Return the number of problems in each category."""
+        return {category: len(problems) for category, problems in self._index.by_category.items()}
+
+    def get_difficulty_counts(self) -> dict[str, int]:
+        """Return the number of problems at each difficulty level."""
+        return {difficulty: len(problems) for difficulty, problems in self._index.by_difficulty.items()}
+
+    def get_category_points(self) -> dict[str, int]:
+        """Return the total points available in each category."""
+        return dict(self._index.category_points)
+
+    def get_difficulty_points(self) -> dict[str, int]:
+        """Return the total points available at each difficulty level."""
+        return dict(self._index.difficulty_points)
+
+    def get_points(self, problem_ids: Iterable[str]) -> int:
+        """Return the points earned by solving the given problems; unknown ids count 0."""
+        by_id = self._index.by_id
+        return sum(by_id[pid].points for pid in problem_ids if pid in by_id)
 
 
 def get_categories() -> list[str]:
@@ -0,0 +1,148 @@
+"""Offset index into the problem library file.
+
+The library is scanned once, a chunk at a time, to record where each
+problem's JSON object starts and ends in the file. Afterwards a single
+problem is read by seeking to its byte range and parsing only that slice,
+so the heavy fields of problems nobody is looking at (descriptions,
+starter code, hints, solutions) do not have to stay in memory.
+
+A digest of each object's bytes is kept with its range, so a read notices
+that the file was rewritten since it was scanned instead of returning
+whatever now sits at the old offsets. A digest of each problem's content
+tells which problems changed between two scans, however the file is
+formatted.
+"""
+
+import codecs
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional
+
+_WHITESPACE = re.compile(r"\s*")
+
+# Bytes read from the file at a time while scanning
+CHUNK_SIZE = 1 << 16
+
+
+class StalePackError(Exception):
+    """Raised when the file no longer matches the offsets recorded by scan()."""
+
+    pass
+
+
+class ProblemPack:
+    """Reads individual problems from a JSON array file by byte offset."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        # problem id -> (byte offset, byte length, digest) of its object in the file
+        self._offsets: dict[str, tuple[int, int, bytes]] = {}
+        # problem id -> digest of the problem's content
+        self._digests: dict[str, bytes] = {}
+
+    def scan(self) -> Iterator[dict]:
+        """Parse every problem in the file, recording its byte range as it goes.
+
+        The file is read in chunks and each problem is yielded as soon as it
+        has been parsed, so the whole document is never held in memory.
+
+        Raises:
+            ValueError: If the file is not a JSON array of objects with string ids
+        """
+        self._offsets = {}
+        self._digests = {}
+        if not self.path.exists():
+            return
+        with open(self.path, "rb") as f:
+            yield from self._scan(f)
+
+    def _scan(self, f: BinaryIO) -> Iterator[dict]:
+        decoder = json.JSONDecoder()
+        text_decoder = codecs.getincrementaldecoder("utf-8")()
+        buffer = ""
+        at_end = False
+        # End of the last parsed object in the buffer and its byte offset in
+        # the file; they differ once the file contains non-ASCII text
+        char_position = 0
+        byte_position = 0
+
+        def fill() -> bool:
+            """Append the next chunk to the buffer; False once the file is exhausted."""
+            nonlocal buffer, at_end
+            if at_end:
+                return False
+            chunk = f.read(CHUNK_SIZE)
+            at_end = not chunk
+            buffer += text_decoder.decode(chunk, final=at_end)
+            return not at_end
+
+        def skip_whitespace(index: int) -> int:
+            while True:
+                index = _WHITESPACE.match(buffer, index).end()
+                if index < len(buffer) or not fill():
+                    return index
+
+        index = skip_whitespace(0)
+        if buffer[index:index + 1] != "[":
+            raise ValueError(f"{self.path} does not contain a JSON array")
+        index = skip_whitespace(index + 1)
+
+        while buffer[index:index + 1] != "]":
+            try:
+                problem, end = decoder.raw_decode(buffer, index)
+            except json.JSONDecodeError:
+                # Possibly an object cut off at the end of the buffer
+                if fill():
+                    continue
+                raise
+            if not isinstance(problem, dict) or not isinstance(problem.get("id"), str):
+                raise ValueError(f"{self.path} has an entry that is not a problem with a string id")
+            start_byte = byte_position + len(buffer[char_position:index].encode("utf-8"))
+            data = buffer[index:end].encode("utf-8")
+            char_position, byte_position = end, start_byte + len(data)
+            digest = hashlib.blake2b(data, digest_size=16).digest()
+            self._offsets[problem["id"]] = (start_byte, len(data), digest)
+            content = json.dumps(problem, sort_keys=True, ensure_ascii=False).encode("utf-8")
+            self._digests[problem["id"]] = hashlib.blake2b(content, digest_size=16).digest()
+            yield problem
+
+            # Drop parsed text now and then, so the buffer stays about a chunk long
+            if char_position >= CHUNK_SIZE:
+                buffer = buffer[char_position:]
+                end -= char_position
+                char_position = 0
+
+            index = skip_whitespace(end)
+            if buffer[index:index + 1] == ",":
+                index = skip_whitespace(index + 1)
+            elif buffer[index:index + 1] != "]":
+                raise ValueError(f"{self.path} is not a valid JSON array")
+
+    def read(self, problem_id: str) -> Optional[dict]:
+        """Read one problem from the file, or None if it is not in the index.
+
+        Raises:
+            StalePackError: If the file changed since it was scanned
+        """
+        location = self._offsets.get(problem_id)
+        if location is None:
+            return None
+        offset, length, digest = location
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                data = f.read(length)
+        except OSError as e:
+            raise StalePackError(str(e)) from e
+        if hashlib.blake2b(data, digest_size=16).digest() != digest:
+            raise StalePackError(f"{self.path} changed since it was scanned")
+        return json.loads(data)
+
+    def digests(self) -> dict[str, bytes]:
+        """Return the content digest of every scanned problem, by id."""
+        return dict(self._digests)
+
+    def __contains__(self, problem_id: str) -> bool:
+        return problem_id in self._offsets
@@ -0,0 +1,75 @@
+"""Compact in-memory records of the problem library.
+
+Every problem is held in memory as a ProblemSummary: a frozen, slotted
+record instead of a dict, so it carries no per-instance dict and its
+fields are read by attribute rather than hashed key. Difficulty is an
+enum and category names are interned, so the thousands of records in a
+large library share one object per distinct value.
+"""
+
+import sys
+from dataclasses import dataclass
+from enum import StrEnum
+
+
+class Difficulty(StrEnum):
+    """Difficulty level of a problem. Members compare and hash equal to their names."""
+
+    BEGINNER = "Beginner"
+    INTERMEDIATE = "Intermediate"
+    ADVANCED = "Advanced"
+
+
+# Point values for each difficulty level
+DIFFICULTY_POINTS = {
+    Difficulty.BEGINNER: 1,
+    Difficulty.INTERMEDIATE: 2,
+    Difficulty.ADVANCED: 4,
+}
+
+
+def get_problem_points(problem: dict) -> int:
+    """Get the point value for a problem based on its difficulty."""
+    return DIFFICULTY_POINTS.get(problem.get("difficulty", "Beginner"), 1)
+
+
+@dataclass(frozen=True, slots=True)
+class ProblemSummary:
+    """The compact form of a problem used for lists and totals."""
+
+    id: str
+    title: str
+    category: str
+    difficulty: Difficulty
+    points: int
+
+    def to_dict(self) -> dict:
+        """Return the summary as a plain dict, e.g. to add fields to a response."""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "category": self.category,
+            "difficulty": self.difficulty,
+            "points": self.points,
+        }
+
+
+def summarize_problem(problem: dict) -> ProblemSummary:
+    """Return the summary of a problem: id, title, category, difficulty and points.
+
+    Only summaries are kept in memory for every problem; the other fields are read on demand.
+
+    Raises:
+        ValueError: If the problem's difficulty is not a known level
+    """
+    try:
+        difficulty = Difficulty(problem.get("difficulty", "Beginner"))
+    except ValueError:
+        raise ValueError(f"Problem {problem['id']} has unknown difficulty {problem['difficulty']!r}") from None
+    return ProblemSummary(
+        id=sys.intern(problem["id"]),
+        title=problem.get("title", ""),
+        category=sys.intern(problem.get("category", "Unknown")),
+        difficulty=difficulty,
+        points=DIFFICULTY_POINTS[difficulty],
+    )
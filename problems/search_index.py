@@ -0,0 +1,277 @@
+"""Ranked full-text search over problem titles, descriptions and hints.
+
+An inverted index maps every term to the problems containing it, and each
+posting already holds the problem's BM25 score for that term: document
+frequencies and lengths are fixed once the library is loaded, so nothing
+but a sum is left for query time. Title terms count several times over,
+so a problem named after the query ranks above one that mentions it in
+passing.
+
+Postings are ordered by score, best first, so a query reads only the head
+of each term's list: a word found in most of the library costs no more
+than a rare one. The problems met there are ranked by the scores read,
+and the leading candidates are then scored in full by lookup. Results are
+exact whenever every list fits in the read budget, and otherwise miss only
+problems that match no query term strongly. The positions of each
+category and difficulty are grouped when the library is added. A search
+limited to one skips the other problems while reading, or, when the group
+is small next to the lists, intersects the two and scores exactly.
+
+The last query term is also matched as a prefix of longer terms, for
+type-ahead: "dictionary comp" finds "dictionary comprehension". The
+vocabulary is kept sorted, so the terms sharing a prefix are found by
+bisection.
+"""
+
+import heapq
+import math
+import re
+import sys
+from array import array
+from bisect import bisect_left
+from itertools import chain, compress, islice
+from operator import itemgetter
+from typing import Iterable, Optional
+
+_TOKEN = re.compile(r"[a-z0-9_]+")
+
+# How many times a term in each field counts towards its frequency
+FIELD_WEIGHTS = {"title": 3, "description": 1, "hints": 1}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Most terms a prefix expands to, the most common first
+MAX_PREFIX_TERMS = 16
+
+# Postings one query reads, shared between its terms
+MAX_POSTINGS_READ = 512
+
+# Candidates scored in full, as a multiple of the results asked for
+RESCORE_FACTOR = 3
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase word terms."""
+    return _TOKEN.findall(text.lower())
+
+
+def _field_text(problem: dict, name: str) -> str:
+    value = problem.get(name) or ""
+    if isinstance(value, list):
+        return " ".join(str(item) for item in value)
+    return str(value)
+
+
+class _Postings:
+    """The problems containing one term, as compact arrays.
+
+    While the library is added, positions and weighted frequencies are
+    appended in problem order. finish() turns the frequencies into BM25
+    scores and keeps both arrays ordered best score first. The first lookup
+    of a score by position builds a dict of the term's scores, so only the
+    terms that get searched pay for one.
+    """
+
+    __slots__ = ("positions", "frequencies", "ranked_positions", "ranked_scores", "scores")
+
+    def __init__(self):
+        self.positions = array("i")
+        self.frequencies = array("I")
+        self.ranked_positions = array("i")
+        self.ranked_scores = array("f")
+        self.scores: Optional[dict[int, float]] = None
+
+    def __len__(self) -> int:
+        return len(self.ranked_positions)
+
+    def lookup(self) -> dict[int, float]:
+        """Return the term's scores by problem position."""
+        scores = self.scores
+        if scores is None:
+            scores = self.scores = dict(zip(self.ranked_positions, self.ranked_scores))
+        return scores
+
+
+class SearchIndex:
+    """BM25-ranked inverted index over a fixed set of problems."""
+
+    def __init__(self):
+        self._ids: list[str] = []
+        self._lengths = array("I")
+        self._postings: dict[str, _Postings] = {}
+        # Positions of the problems of each (category, difficulty), with None
+        # standing for any, so a filtered search needs no lookups of its own
+        self._groups: dict[tuple[Optional[str], Optional[str]], set[int]] = {}
+        # Filled in by finish()
+        self._vocabulary: list[str] = []
+
+    def add(self, problem: dict) -> None:
+        """Index a problem's searchable fields. Call finish() once all are added."""
+        position = len(self._ids)
+        self._ids.append(problem["id"])
+        frequencies: dict[str, int] = {}
+        for name, weight in FIELD_WEIGHTS.items():
+            for term in tokenize(_field_text(problem, name)):
+                frequencies[term] = frequencies.get(term, 0) + weight
+        for term, frequency in frequencies.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[sys.intern(term)] = _Postings()
+            postings.positions.append(position)
+            postings.frequencies.append(frequency)
+        self._lengths.append(sum(frequencies.values()))
+        category = problem.get("category", "Unknown")
+        difficulty = problem.get("difficulty", "Beginner")
+        for group in ((category, None), (None, difficulty), (category, difficulty)):
+            self._groups.setdefault(group, set()).add(position)
+
+    def finish(self) -> "SearchIndex":
+        """Score every posting once the whole library has been added."""
+        count = len(self._ids)
+        average_length = sum(self._lengths) / count if count else 0.0
+        lengths = self._lengths
+        for postings in self._postings.values():
+            matches = len(postings.positions)
+            idf = math.log(1 + (count - matches + 0.5) / (matches + 0.5))
+            scores = array("f", (
+                idf * frequency * (K1 + 1) / (frequency + K1 * (1 - B + B * lengths[position] / average_length))
+                for position, frequency in zip(postings.positions, postings.frequencies)
+            ))
+            order = sorted(range(matches), key=scores.__getitem__, reverse=True)
+            postings.ranked_positions = array("i", (postings.positions[i] for i in order))
+            postings.ranked_scores = array("f", (scores[i] for i in order))
+            postings.positions = array("i")
+            postings.frequencies = array("I")
+        self._vocabulary = sorted(self._postings)
+        return self
+
+    def _prefix_terms(self, prefix: str) -> list[str]:
+        """Return the indexed terms that start with prefix, the most common first."""
+        vocabulary = self._vocabulary
+        end = start = bisect_left(vocabulary, prefix)
+        while end < len(vocabulary) and vocabulary[end].startswith(prefix):
+            end += 1
+        terms = vocabulary[start:end]
+        if len(terms) > MAX_PREFIX_TERMS:
+            terms = heapq.nlargest(MAX_PREFIX_TERMS, terms, key=lambda t: len(self._postings[t]))
+        return terms
+
+    def search(
+        self, query: str, limit: int = 20, category: Optional[str] = None, difficulty: Optional[str] = None
+    ) -> list[tuple[str, float]]:
+        """
+        Rank the problems matching any query term.
+
+        Args:
+            query: Search text; its last term also matches as a prefix
+            limit: Most results to return
+            category: Only return problems of this category, if given
+            difficulty: Only return problems of this difficulty level, if given
+
+        Returns:
+            (problem id, score) pairs, best first
+        """
+        terms = tokenize(query)
+        if not terms or limit <= 0:
+            return []
+        positions = None
+        if category is not None or difficulty is not None:
+            positions = self._groups.get((category, difficulty))
+            if positions is None:
+                return []
+
+        *whole, last = terms
+        expansions = self._prefix_terms(last)
+        # Each slot is the terms one query term matches; a problem matching
+        # several expansions of the prefix counts its best one
+        slots = [[term] for term in dict.fromkeys(whole) if term in self._postings]
+        # Words in most of the library hardly change the ranking; leave them out
+        distinctive = [slot for slot in slots if len(self._postings[slot[0]]) <= len(self._ids) // 2]
+        if distinctive or expansions:
+            slots = distinctive
+        if expansions:
+            slots.append(expansions)
+        if not slots:
+            return []
+
+        # Read the best postings of every slot, then score the leading
+        # candidates in full, since a problem may be past the read part of
+        # some lists. A filter small enough to be matched against every
+        # list in the budget gives exact scores straight away.
+        budget = max(limit, MAX_POSTINGS_READ // len(slots))
+        exact = False
+        if positions is not None:
+            exact = sum(
+                min(len(positions), len(self._postings[term])) for slot in slots for term in slot
+            ) <= MAX_POSTINGS_READ
+            # Reading past the other problems' postings costs too, so shrink the
+            # budget to about as many postings read as without a filter
+            budget = max(limit * RESCORE_FACTOR, budget * len(positions) // len(self._ids))
+        partial: dict[int, float] = {}
+        complete = True
+        for slot in slots:
+            share = budget // len(slot) + 1
+            heads = []
+            for term in slot:
+                if exact:
+                    head, whole = _intersect(self._postings[term], positions), True
+                else:
+                    head, whole = _read_head(self._postings[term], share, positions)
+                heads.append(head)
+                complete = complete and whole
+            if len(heads) == 1:
+                best = heads[0]
+            else:
+                # Ordered by score, so each position keeps its best one
+                best = dict(sorted(chain.from_iterable(heads), key=itemgetter(1))).items()
+            if not partial:
+                partial = dict(best)
+                continue
+            get = partial.get
+            for position, score in best:
+                partial[position] = get(position, 0.0) + score
+
+        if complete:
+            # Every posting was read, so the partial scores are the full ones
+            ranked = heapq.nlargest(limit, ((s, -p) for p, s in partial.items()))
+        else:
+            candidates = sorted(partial, key=partial.__getitem__, reverse=True)[:limit * RESCORE_FACTOR]
+            lookups = [[self._postings[term].lookup() for term in slot] for slot in slots]
+            ranked = heapq.nlargest(limit, ((_full_score(lookups, p), -p) for p in candidates))
+        return [(self._ids[-negated], score) for score, negated in ranked]
+
+
+def _full_score(lookups: list[list[dict[int, float]]], position: int) -> float:
+    """Return a problem's score: for each slot, its best score for any of the slot's terms."""
+    total = 0.0
+    for scores in lookups:
+        if len(scores) == 1:
+            total += scores[0].get(position, 0.0)
+        else:
+            total += max(by_position.get(position, 0.0) for by_position in scores)
+    return total
+
+
+def _read_head(postings: _Postings, share: int, positions: Optional[set[int]]) -> tuple[Iterable, bool]:
+    """Return the best share postings of a term, from the given positions only if any.
+
+    Also returns whether they are all of the term's postings there are.
+    """
+    if positions is None:
+        head = zip(postings.ranked_positions[:share], postings.ranked_scores[:share])
+        return head, len(postings) <= share
+    ranked = postings.ranked_positions
+    head = list(islice(compress(zip(ranked, postings.ranked_scores), map(positions.__contains__, ranked)), share + 1))
+    if len(head) > share:
+        return head[:share], False
+    return head, True
+
+
+def _intersect(postings: _Postings, positions: set[int]) -> list[tuple[int, float]]:
+    """Return every posting of a term at the given positions, walking the shorter of the two."""
+    if len(postings) <= len(positions):
+        return [(p, s) for p, s in zip(postings.ranked_positions, postings.ranked_scores) if p in positions]
+    scores = postings.lookup()
+    return [(p, scores[p]) for p in positions if p in scores]
@@ -0,0 +1,58 @@
+"""Tests for reloading the problem library while it is being watched."""
+
+import json
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from problems import ProblemLoader
+
+PROBLEM = {"id": "p1", "title": "Hello", "category": "Basics", "difficulty": "Beginner", "expected_output": "hi"}
+
+
+class WatcherTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "problems.json"
+        self.write([PROBLEM])
+        self.loader = ProblemLoader(problems_file=self.path)
+        self.loader.start_watching(interval=0.01)
+        self.addCleanup(self.loader.stop_watching)
+
+    def write(self, problems) -> None:
+        self.path.write_text(json.dumps(problems), encoding="utf-8")
+        # Make every write visible to the watcher, even within one timestamp tick
+        stat = self.path.stat()
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + len(problems) + 1))
+
+    def wait_for(self, condition) -> bool:
+        deadline = time.monotonic() + 2.0
+        while time.monotonic() < deadline:
+            if condition():
+                return True
+            time.sleep(0.01)
+        return False
+
+    def test_bad_entries_keep_the_last_good_library(self):
+        for bad in ([{"title": "no id"}], ["not an object"], [{"id": 7}]):
+            with self.subTest(bad=bad):
+                version = self.loader.version
+                self.write([PROBLEM, *bad])
+                self.assertTrue(self.wait_for(lambda: self.loader._failed_state == self.loader._stat()))
+                self.assertEqual(self.loader.version, version)
+                self.assertEqual(self.loader.get_problem_by_id("p1")["title"], "Hello")
+                self.assertTrue(self.loader._watcher.is_alive())
+
+    def test_fixed_file_is_reloaded(self):
+        self.write([{"title": "no id"}])
+        self.assertTrue(self.wait_for(lambda: self.loader._failed_state == self.loader._stat()))
+        self.write([PROBLEM, dict(PROBLEM, id="p2", title="Again")])
+        self.assertTrue(self.wait_for(lambda: self.loader.get_problem_by_id("p2") is not None))
+        self.assertEqual(self.loader.get_problem_by_id("p2")["title"], "Again")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,19 +1,9 @@
 """Reusable UI components for Python Coach Streamlit app."""
 
 import streamlit as st
-from typing import Optional
+from typing import Callable, Optional
 
-# Point values for each difficulty level
-DIFFICULTY_POINTS = {
-    "Beginner": 1,
-    "Intermediate": 2,
-    "Advanced": 4,
-}
-
-
-def get_problem_points(problem: dict) -> int:
-    """Get the point value for a problem based on its difficulty."""
-    return DIFFICULTY_POINTS.get(problem.get("difficulty", "Beginner"), 1)
+from problems import DIFFICULTY_POINTS, ProblemSummary, get_problem_points
 
 
 def calculate_total_points(problems: list[dict]) -> int:
@@ -240,10 +230,11 @@ def render_hint_section(hints: list[str], current_hint_index: int) -> None:
 def render_sidebar(
     categories: list[str],
     difficulties: list[str],
-    problems: list[dict],
+    problems: list[ProblemSummary],
     selected_category: str,
     selected_difficulty: str,
     completed_problem_ids: set[str] = None,
+    search: Optional[Callable[[str, str, str], list[ProblemSummary]]] = None,
 ) -> tuple[str, str, Optional[str]]:
     """
     Render the sidebar with problem navigation.
@@ -251,10 +242,12 @@ def render_sidebar(
     Args:
         categories: List of available categories
         difficulties: List of difficulty levels
-        problems: List of all problems
+        problems: Summaries of all problems (see ProblemLoader.get_problem_summaries)
         selected_category: Currently selected category
         selected_difficulty: Currently selected difficulty
         completed_problem_ids: Set of completed problem IDs
+        search: Called with (query, category, difficulty) to rank matching summaries;
+            without it no search box is shown
 
     Returns:
         Tuple of (category, difficulty, selected_problem_id)
@@ -269,6 +262,14 @@ def render_sidebar(
     # Filters
     st.sidebar.markdown("### 🔍 Filter Problems")
 
+    query = ""
+    if search is not None:
+        query = st.sidebar.text_input(
+            "Search",
+            placeholder="e.g. dictionary comprehension",
+            key="problem_search",
+        )
+
     category = st.sidebar.selectbox(
         "Category",
         options=categories,
@@ -285,38 +286,41 @@ def render_sidebar(
 
     st.sidebar.markdown("---")
 
-    # Filter problems
-    filtered_problems = problems
-    if category != "All":
-        filtered_problems = [p for p in filtered_problems if p["category"] == category]
-    if difficulty != "All":
-        filtered_problems = [p for p in filtered_problems if p["difficulty"] == difficulty]
+    # Filter problems, best search matches first when searching
+    if query.strip():
+        filtered_problems = search(query, category, difficulty)
+    else:
+        filtered_problems = problems
+        if category != "All":
+            filtered_problems = [p for p in filtered_problems if p.category == category]
+        if difficulty != "All":
+            filtered_problems = [p for p in filtered_problems if p.difficulty == difficulty]
 
     # Count completed in filtered
-    completed_in_filter = sum(1 for p in filtered_problems if p["id"] in completed_problem_ids)
+    completed_in_filter = sum(1 for p in filtered_problems if p.id in completed_problem_ids)
 
     # Problem list
     st.sidebar.markdown(f"### 📚 Problems ({completed_in_filter}/{len(filtered_problems)})")
 
     selected_problem_id = None
     for problem in filtered_problems:
-        is_completed = problem["id"] in completed_problem_ids
+        is_completed = problem.id in completed_problem_ids
         difficulty_icon = {
             "Beginner": "🟢",
             "Intermediate": "🟡",
             "Advanced": "🔴",
-        }.get(problem["difficulty"], "⚪")
+        }.get(problem.difficulty, "⚪")
 
         # Add checkmark for completed problems
         completed_mark = "✅ " if is_completed else ""
-        points = DIFFICULTY_POINTS.get(problem["difficulty"], 1)
+        points = problem.points
 
         if st.sidebar.button(
-            f"{completed_mark}{difficulty_icon} {problem['title']} (+{points})",
-            key=f"problem_{problem['id']}",
+            f"{completed_mark}{difficulty_icon} {problem.title} (+{points})",
+            key=f"problem_{problem.id}",
             use_container_width=True,
         ):
-            selected_problem_id = problem["id"]
+            selected_problem_id = problem.id
 
     return category, difficulty, selected_problem_id
 